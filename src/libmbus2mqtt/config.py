@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import logging
 import os
+import secrets
 from copy import deepcopy
 from pathlib import Path
 from typing import Annotated, Any
-from uuid import uuid4
 
 import yaml
 from pydantic import BaseModel, Field, field_validator, model_validator
@@ -31,6 +31,7 @@ from libmbus2mqtt.constants import (
     MBUS_ID_MIN,
     MQTT_DEFAULT_BASE_TOPIC,
     MQTT_DEFAULT_KEEPALIVE,
+    MQTT_DEFAULT_MAX_INFLIGHT,
     MQTT_DEFAULT_PORT,
     MQTT_DEFAULT_QOS,
     POLLING_DEFAULT_INTERVAL,
@@ -59,6 +60,7 @@ ENV_VAR_PATHS: dict[str, EnvPath] = {
     f"{ENV_PREFIX}_MQTT_KEEPALIVE": ("mqtt", "keepalive"),
     f"{ENV_PREFIX}_MQTT_QOS": ("mqtt", "qos"),
     f"{ENV_PREFIX}_MQTT_BASE_TOPIC": ("mqtt", "base_topic"),
+    f"{ENV_PREFIX}_MQTT_MAX_INFLIGHT": ("mqtt", "max_inflight"),
     # Home Assistant
     f"{ENV_PREFIX}_HOMEASSISTANT_ENABLED": ("homeassistant", "enabled"),
     f"{ENV_PREFIX}_HOMEASSISTANT_DISCOVERY_PREFIX": ("homeassistant", "discovery_prefix"),
@@ -167,11 +169,16 @@ class MqttConfig(BaseModel):
     keepalive: int = Field(default=MQTT_DEFAULT_KEEPALIVE, ge=1, description="Keepalive interval")
     qos: int = Field(default=MQTT_DEFAULT_QOS, ge=0, le=2, description="QoS level")
     base_topic: str = Field(default=MQTT_DEFAULT_BASE_TOPIC, description="Base MQTT topic")
+    max_inflight: int = Field(
+        default=MQTT_DEFAULT_MAX_INFLIGHT,
+        ge=1,
+        description="Maximum QoS 1/2 messages awaiting broker acknowledgement",
+    )
 
     @model_validator(mode="after")
     def generate_client_id(self) -> MqttConfig:
         if self.client_id is None:
-            self.client_id = f"libmbus2mqtt-{uuid4().hex[:8]}"
+            self.client_id = f"libmbus2mqtt-{secrets.token_hex(4)}"
         return self
 
 
@@ -350,6 +357,7 @@ mqtt:
   keepalive: 60                 # Connection keepalive in seconds
   qos: 1                        # Message quality of service (0, 1, or 2)
   base_topic: libmbus2mqtt      # Base MQTT topic
+  max_inflight: 100             # Max unacknowledged QoS 1/2 messages
 
 # Home Assistant Integration
 homeassistant:
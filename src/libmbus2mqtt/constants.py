@@ -28,6 +28,7 @@ MBUS_DEFAULT_SCAN_TIMEOUT = (
 MQTT_DEFAULT_PORT = 1883
 MQTT_DEFAULT_KEEPALIVE = 60
 MQTT_DEFAULT_QOS = 1
+MQTT_DEFAULT_MAX_INFLIGHT = 100
 MQTT_DEFAULT_BASE_TOPIC = "libmbus2mqtt"
 
 # MQTT Topics (format strings)
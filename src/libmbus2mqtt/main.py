@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import signal
 import time
+from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from libmbus2mqtt.constants import APP_VERSION
@@ -181,8 +182,9 @@ class Daemon:
         if self._bridge_info:
             self._bridge_info.publish()
 
-        # Publish bridge discovery
+        # Publish bridge discovery; the broker may have lost retained configs
         if self._ha_discovery:
+            self._ha_discovery.mark_stale()
             self._ha_discovery.publish_bridge_discovery()
 
         # Publish device discovery for known devices
@@ -239,6 +241,7 @@ class Daemon:
             return
 
         online_count = 0
+        poll_time = datetime.now()
 
         for device in self._devices.values():
             if not device.enabled:
@@ -253,7 +256,7 @@ class Daemon:
                 # Update device with new data
                 first_data = device.mbus_data is None
                 device.update_from_mbus_data(mbus_data)
-                device.availability.poll_success()
+                device.availability.poll_success(poll_time)
                 online_count += 1
 
                 # Publish HA discovery on first successful poll
@@ -270,7 +273,7 @@ class Daemon:
 
                 logger.debug(f"Polled device {device.address}: success")
             else:
-                device.availability.poll_fail()
+                device.availability.poll_fail(poll_time)
                 logger.warning(
                     f"Poll failed for device {device.address} "
                     f"({device.availability.poll_consecutive_fails} consecutive)"
@@ -306,7 +309,7 @@ class Daemon:
         # Mark all devices offline
         if self._mqtt:
             for device in self._devices.values():
-                if device.availability.status == AvailabilityStatus.ONLINE:
+                if device.availability.status is AvailabilityStatus.ONLINE:
                     self._mqtt.publish_device_availability(
                         device.object_id,
                         AvailabilityStatus.OFFLINE.value,
@@ -114,13 +114,9 @@ class MbusInterface:
                         result.stderr.strip(),
                     )
                 else:
-                    devices: list[int] = []
-                    for line in result.stdout.splitlines():
-                        match = SCAN_PATTERN.search(line)
-                        if match:
-                            device_id = int(match.group(1))
-                            devices.append(device_id)
-                            logger.debug(f"Found device at address {device_id}")
+                    devices = [int(address) for address in SCAN_PATTERN.findall(result.stdout)]
+                    if devices:
+                        logger.debug(f"Found devices at addresses {devices}")
 
                     logger.info(f"Scan complete: {len(devices)} device(s) found")
                     return devices
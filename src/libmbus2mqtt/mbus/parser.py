@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sys
 import xml.etree.ElementTree as ET
 
 from libmbus2mqtt.logging import get_logger
@@ -9,6 +10,22 @@ from libmbus2mqtt.models.mbus import DataRecord, MbusData, SlaveInformation
 
 logger = get_logger("mbus.parser")
 
+# Low-cardinality fields repeated across devices/records; interned so equal
+# values share one string object. Record values and ids are not interned.
+_INTERN_FIELDS = frozenset(
+    {
+        "Manufacturer",
+        "Medium",
+        "Version",
+        "ProductName",
+        "Unit",
+        "Function",
+        "Device",
+        "Tariff",
+        "StorageNumber",
+    }
+)
+
 
 class MbusParseError(Exception):
     """Error parsing M-Bus XML response."""
@@ -62,7 +79,8 @@ def parse_xml(xml_string: str) -> MbusData:
             logger.warning(f"Failed to parse DataRecord {record_id}: {e}")
             continue
 
-    return MbusData(slave_information=slave_info, data_records=data_records)
+    # Components are validated above; skip re-validating the container
+    return MbusData.model_construct(slave_information=slave_info, data_records=data_records)
 
 
 def _element_to_dict(element: ET.Element) -> dict[str, str | None]:
@@ -72,7 +90,10 @@ def _element_to_dict(element: ET.Element) -> dict[str, str | None]:
         # Skip nested complex elements (like DataRecord within SlaveInformation)
         if len(child) > 0:
             continue
-        result[child.tag] = child.text
+        text = child.text
+        if text is not None and child.tag in _INTERN_FIELDS:
+            text = sys.intern(text)
+        result[child.tag] = text
     return result
 
 
@@ -11,6 +11,8 @@ from libmbus2mqtt.logging import get_logger
 
 logger = get_logger("mbus.tty")
 
+SYSFS_TTY_PATH = Path("/sys/class/tty")
+
 
 class UsbInfo(TypedDict):
     """USB device information."""
@@ -79,8 +81,9 @@ def check_tty_device(device_path: str) -> TtyDeviceInfo:
 
     # Get USB info if applicable
     if result["type"] == "USB Serial":
-        result["usb_info"] = _get_usb_info(device_path)
-        result["driver"] = _get_driver_name(device_path)
+        device_link = SYSFS_TTY_PATH / path.name / "device"
+        result["usb_info"] = _get_usb_info(device_link)
+        result["driver"] = _get_driver_name(device_link)
 
     # Check if device is busy (try to detect lock)
     result["is_busy"] = _check_device_busy(device_path)
@@ -112,20 +115,26 @@ def _determine_device_type(device_path: str) -> str:
     return "Unknown"
 
 
-def _get_usb_info(device_path: str) -> UsbInfo | None:
-    """Get USB device information."""
-    path = Path(device_path)
-    name = path.name
-
-    # Find the sysfs path for this device
-    sysfs_base = Path("/sys/class/tty") / name
-
-    if not sysfs_base.exists():
+def _read_sysfs_str(path: Path) -> str | None:
+    """Read a sysfs attribute file in a single read, or None if unavailable."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        # Sysfs attributes are at most one page long
+        data = os.read(fd, 4096)
+    except OSError:
         return None
+    finally:
+        os.close(fd)
+    return data.decode("utf-8", errors="replace").strip()
 
+
+def _get_usb_info(device_link: Path) -> UsbInfo | None:
+    """Get USB device information from the TTY's sysfs device link."""
     # Navigate to the USB device info
     try:
-        device_link = sysfs_base / "device"
         if not device_link.exists():
             return None
 
@@ -136,24 +145,13 @@ def _get_usb_info(device_path: str) -> UsbInfo | None:
         for _ in range(5):  # Max 5 levels up
             usb_path = usb_path.parent
 
-            id_vendor_file = usb_path / "idVendor"
-            id_product_file = usb_path / "idProduct"
-
-            if id_vendor_file.exists() and id_product_file.exists():
-                vendor_id = id_vendor_file.read_text().strip()
-                product_id = id_product_file.read_text().strip()
+            vendor_id = _read_sysfs_str(usb_path / "idVendor")
+            product_id = _read_sysfs_str(usb_path / "idProduct")
 
-                # Try to get product name
-                product_name: str | None = None
-                product_file = usb_path / "product"
-                if product_file.exists():
-                    product_name = product_file.read_text().strip()
-
-                # Try to get manufacturer
-                manufacturer: str | None = None
-                manufacturer_file = usb_path / "manufacturer"
-                if manufacturer_file.exists():
-                    manufacturer = manufacturer_file.read_text().strip()
+            if vendor_id is not None and product_id is not None:
+                # Product name and manufacturer are optional attributes
+                product_name = _read_sysfs_str(usb_path / "product")
+                manufacturer = _read_sysfs_str(usb_path / "manufacturer")
 
                 return {
                     "vendor": f"{vendor_id}:{product_id}",
@@ -167,12 +165,9 @@ def _get_usb_info(device_path: str) -> UsbInfo | None:
     return None
 
 
-def _get_driver_name(device_path: str) -> str | None:
-    """Get the kernel driver name for a USB serial device."""
-    path = Path(device_path)
-    name = path.name
-
-    sysfs_path = Path("/sys/class/tty") / name / "device" / "driver"
+def _get_driver_name(device_link: Path) -> str | None:
+    """Get the kernel driver name from the TTY's sysfs device link."""
+    sysfs_path = device_link / "driver"
 
     try:
         if sysfs_path.exists():
@@ -1,6 +1,11 @@
 """Data models."""
 
-from libmbus2mqtt.models.device import AvailabilityStatus, Device, DeviceAvailability
+from libmbus2mqtt.models.device import (
+    AvailabilityStatus,
+    Device,
+    DeviceAvailability,
+    DeviceRuntime,
+)
 from libmbus2mqtt.models.mbus import DataRecord, MbusData, SlaveInformation
 
 __all__ = [
@@ -8,6 +13,7 @@ __all__ = [
     "DataRecord",
     "Device",
     "DeviceAvailability",
+    "DeviceRuntime",
     "MbusData",
     "SlaveInformation",
 ]
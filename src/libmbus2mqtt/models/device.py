@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -29,33 +31,43 @@ class DeviceAvailability(BaseModel):
     timeout_threshold: int = 3
     status_changed: bool = False
 
-    def poll_success(self) -> None:
-        """Record a successful poll."""
-        old_status = self.status
+    def poll_success(self, now: datetime | None = None) -> None:
+        """Record a successful poll, optionally at a timestamp shared by the poll cycle."""
+        self.status_changed = self.status is not AvailabilityStatus.ONLINE
         self.status = AvailabilityStatus.ONLINE
         self.last_poll_status = "success"
-        self.last_poll_time = datetime.now()
+        self.last_poll_time = now if now is not None else datetime.now()
         self.poll_consecutive_fails = 0
-        self.status_changed = old_status != self.status
 
-    def poll_fail(self) -> None:
-        """Record a failed poll."""
-        old_status = self.status
+    def poll_fail(self, now: datetime | None = None) -> None:
+        """Record a failed poll, optionally at a timestamp shared by the poll cycle."""
         self.last_poll_status = "fail"
-        self.last_poll_time = datetime.now()
+        self.last_poll_time = now if now is not None else datetime.now()
         self.poll_fail_count += 1
         self.poll_consecutive_fails += 1
 
-        if self.poll_consecutive_fails >= self.timeout_threshold:
+        self.status_changed = (
+            self.poll_consecutive_fails >= self.timeout_threshold
+            and self.status is not AvailabilityStatus.OFFLINE
+        )
+        if self.status_changed:
             self.status = AvailabilityStatus.OFFLINE
 
-        self.status_changed = old_status != self.status
-
     def reset_changed_flag(self) -> None:
         """Reset the status_changed flag after publishing."""
         self.status_changed = False
 
 
+@dataclass(slots=True)
+class DeviceRuntime:
+    """Mutable per-poll device state, kept outside Pydantic validation."""
+
+    mbus_data: MbusData | None = None
+    availability: DeviceAvailability = field(default_factory=DeviceAvailability)
+    ha_template: Mapping[str, Mapping[str, str]] | None = None
+    ha_discovery_published: bool = False
+
+
 class Device(BaseModel):
     """M-Bus device representation."""
 
@@ -73,19 +85,46 @@ class Device(BaseModel):
     version: str | None = None
     serial_number: str | None = None
 
-    # Runtime state
-    mbus_data: MbusData | None = Field(default=None, exclude=True)
-    availability: DeviceAvailability = Field(default_factory=DeviceAvailability)
-
-    # Home Assistant state
-    ha_template: dict[str, dict[str, str]] | None = Field(default=None, exclude=True)
-    ha_discovery_published: bool = Field(default=False, exclude=True)
+    # Runtime state (poll data, availability, HA state)
+    runtime: DeviceRuntime = Field(default_factory=DeviceRuntime, exclude=True)
 
     model_config = {"arbitrary_types_allowed": True}
 
+    @property
+    def mbus_data(self) -> MbusData | None:
+        """Last successfully parsed M-Bus data."""
+        return self.runtime.mbus_data
+
+    @mbus_data.setter
+    def mbus_data(self, value: MbusData | None) -> None:
+        self.runtime.mbus_data = value
+
+    @property
+    def availability(self) -> DeviceAvailability:
+        """Availability tracker for this device."""
+        return self.runtime.availability
+
+    @property
+    def ha_template(self) -> Mapping[str, Mapping[str, str]] | None:
+        """Home Assistant template matched for this device."""
+        return self.runtime.ha_template
+
+    @ha_template.setter
+    def ha_template(self, value: Mapping[str, Mapping[str, str]] | None) -> None:
+        self.runtime.ha_template = value
+
+    @property
+    def ha_discovery_published(self) -> bool:
+        """Whether HA discovery has been published for this device."""
+        return self.runtime.ha_discovery_published
+
+    @ha_discovery_published.setter
+    def ha_discovery_published(self, value: bool) -> None:
+        self.runtime.ha_discovery_published = value
+
     def update_from_mbus_data(self, data: MbusData) -> None:
         """Update device info from parsed M-Bus data."""
-        self.mbus_data = data
+        self.runtime.mbus_data = data
         self.identifier = data.device_id
         self.manufacturer = data.manufacturer
         self.model = data.product_name
@@ -112,4 +151,4 @@ class Device(BaseModel):
     @property
     def is_online(self) -> bool:
         """Check if device is online."""
-        return self.availability.status == AvailabilityStatus.ONLINE
+        return self.runtime.availability.status is AvailabilityStatus.ONLINE
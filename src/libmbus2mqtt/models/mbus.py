@@ -2,10 +2,22 @@
 
 from __future__ import annotations
 
+import re
+from collections.abc import Mapping
+from functools import lru_cache
 from typing import Any
 
 from pydantic import BaseModel, Field
 
+_VALUE_JSON_KEY = re.compile(r"(?<=value_json\.)(\S+)")
+
+
+@lru_cache(maxsize=256)
+def _state_key(value_template: str) -> str | None:
+    """Return the value_json field a value template reads, if any."""
+    match = _VALUE_JSON_KEY.search(value_template)
+    return match.group() if match else None
+
 
 class SlaveInformation(BaseModel):
     """M-Bus slave device information from XML response."""
@@ -78,7 +90,7 @@ class MbusData(BaseModel):
         record = self.data_records.get(record_id)
         return record.value if record else None
 
-    def to_ha_state(self, template: dict[str, dict[str, str]]) -> dict[str, str | None]:
+    def to_ha_state(self, template: Mapping[str, Mapping[str, str]]) -> dict[str, str | None]:
         """
         Convert data records to Home Assistant state payload.
 
@@ -88,20 +100,15 @@ class MbusData(BaseModel):
         Returns:
             Dictionary with json field names and values
         """
-        import re
-
         state: dict[str, str | None] = {}
-        regex = re.compile(r"(?<=value_json\.)(\S+)")
 
         for component_id, config in template.items():
             # Skip custom sensors (they derive values from other fields)
             if component_id.startswith("custom-"):
                 continue
 
-            value_template = config.get("value_template", "")
-            match = regex.search(value_template)
-            if match:
-                json_name = match.group()
+            json_name = _state_key(config.get("value_template", ""))
+            if json_name:
                 state[json_name] = self.get_record_value(component_id)
 
         return state
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
@@ -21,7 +22,9 @@ class BridgeInfo:
 
     def __init__(self, mqtt_client: MqttClient) -> None:
         self.mqtt = mqtt_client
-        self._start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
+        self._last_uptime_seconds = -1
+        self._last_uptime_str = ""
         self._discovered_devices = 0
         self._online_devices = 0
         self._last_scan: datetime | None = None
@@ -42,18 +45,25 @@ class BridgeInfo:
     @property
     def uptime(self) -> str:
         """Get formatted uptime string."""
-        delta = datetime.now() - self._start_time
-        days = delta.days
-        hours, remainder = divmod(delta.seconds, 3600)
+        elapsed = int(time.monotonic() - self._start_monotonic)
+        if elapsed == self._last_uptime_seconds:
+            return self._last_uptime_str
+
+        days, remainder = divmod(elapsed, 86400)
+        hours, remainder = divmod(remainder, 3600)
         minutes, seconds = divmod(remainder, 60)
 
-        if days > 0:
-            return f"{days}d {hours}h {minutes}m"
-        if hours > 0:
-            return f"{hours}h {minutes}m {seconds}s"
-        if minutes > 0:
-            return f"{minutes}m {seconds}s"
-        return f"{seconds}s"
+        self._last_uptime_seconds = elapsed
+        self._last_uptime_str = (
+            f"{days}d {hours}h {minutes}m"
+            if days
+            else f"{hours}h {minutes}m {seconds}s"
+            if hours
+            else f"{minutes}m {seconds}s"
+            if minutes
+            else f"{seconds}s"
+        )
+        return self._last_uptime_str
 
     def set_discovered_devices(self, count: int) -> None:
         """Update discovered device count."""
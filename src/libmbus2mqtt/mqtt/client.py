@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 import json
+import logging
 import threading
-import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 import paho.mqtt.client as mqtt
 
+try:
+    import orjson
+
+    _dumps: Callable[[Any], str | bytes] = orjson.dumps
+except ImportError:  # pragma: no cover - optional speedup
+    _dumps = json.dumps
+
 from libmbus2mqtt.constants import (
-    APP_NAME,
     TOPIC_BRIDGE_STATE,
     TOPIC_COMMAND_LOG_LEVEL,
     TOPIC_COMMAND_POLL_INTERVAL,
@@ -29,6 +36,13 @@ logger = get_logger("mqtt.client")
 # Callback types
 CommandCallback = Callable[[str, str], None]
 
+# (topic, payload, retain) tuple accepted by MqttClient.publish_batch
+BatchMessage = tuple[str, str | dict[str, Any], bool]
+
+# (component, object_id, config) tuple accepted by MqttClient.publish_ha_discovery_batch;
+# the config may already be serialized to JSON
+DiscoveryEntry = tuple[str, str, str | dict[str, Any]]
+
 
 class MqttClient:
     """MQTT client with threading support."""
@@ -41,6 +55,7 @@ class MqttClient:
         self._command_callbacks: dict[str, CommandCallback] = {}
         self._on_connect_callback: Callable[[], None] | None = None
         self._on_disconnect_callback: Callable[[], None] | None = None
+        self._bridge_state_topic = TOPIC_BRIDGE_STATE.format(base=self.base_topic)
 
     @property
     def base_topic(self) -> str:
@@ -52,19 +67,13 @@ class MqttClient:
         """Check if client is connected."""
         return self._connected.is_set()
 
-    def _get_client_id(self) -> str:
-        """Generate or return configured client ID."""
-        if self.config.client_id:
-            return self.config.client_id
-        return f"{APP_NAME}_{uuid.uuid4().hex[:8]}"
-
     def connect(self) -> None:
         """Connect to MQTT broker."""
-        client_id = self._get_client_id()
         logger.info(f"Connecting to MQTT broker {self.config.host}:{self.config.port}")
 
         self._client = mqtt.Client(
-            client_id=client_id,
+            # Always set: MqttConfig generates one when the config leaves it empty
+            client_id=self.config.client_id,
             callback_api_version=mqtt.CallbackAPIVersion.VERSION2,  # type: ignore[attr-defined]
         )
 
@@ -80,8 +89,11 @@ class MqttClient:
                 self.config.password,
             )
 
+        # Allow discovery bursts to stream without stalling on broker acks
+        self._client.max_inflight_messages_set(self.config.max_inflight)
+
         # Set last will for bridge availability
-        will_topic = TOPIC_BRIDGE_STATE.format(base=self.base_topic)
+        will_topic = self._bridge_state_topic
         self._client.will_set(will_topic, "offline", qos=1, retain=True)
 
         # Connect
@@ -163,17 +175,23 @@ class MqttClient:
     ) -> None:
         """Handle incoming messages."""
         topic = message.topic
-        payload = message.payload.decode("utf-8", errors="replace")
-        logger.debug(f"Received message on {topic}: {payload}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Received message on %s: %s",
+                topic,
+                message.payload.decode("utf-8", errors="replace"),
+            )
 
         # Check if this is a command topic
-        for command_topic, callback in self._command_callbacks.items():
-            if topic == command_topic:
-                try:
-                    callback(topic, payload)
-                except Exception as e:
-                    logger.error(f"Error handling command on {topic}: {e}")
-                break
+        callback = self._command_callbacks.get(topic)
+        if callback is None:
+            return
+
+        payload = message.payload.decode("utf-8", errors="replace")
+        try:
+            callback(topic, payload)
+        except Exception as e:
+            logger.error(f"Error handling command on {topic}: {e}")
 
     def _subscribe_to_commands(self) -> None:
         """Subscribe to command topics."""
@@ -220,26 +238,81 @@ class MqttClient:
             logger.warning(f"Cannot publish to {topic}: not connected")
             return False
 
-        if isinstance(payload, dict):
-            payload = json.dumps(payload)
+        data = _dumps(payload) if isinstance(payload, dict) else payload
 
         result = self._client.publish(
             topic,
-            payload,
+            data,
             qos=qos if qos is not None else self.config.qos,
             retain=retain,
         )
 
-        if result.rc != mqtt.MQTT_ERR_SUCCESS:
+        if result.rc:  # MQTT_ERR_SUCCESS is 0
             logger.warning(f"Failed to publish to {topic}: {result.rc}")
             return False
 
         return True
 
+    def publish_batch(
+        self,
+        messages: Iterable[BatchMessage],
+        qos: int | None = None,
+    ) -> bool:
+        """
+        Publish several messages back-to-back.
+
+        All payloads are serialized before the first one is queued, so a
+        payload that fails to serialize leaves none of the messages published.
+
+        Args:
+            messages: (topic, payload, retain) tuples
+            qos: QoS for all messages (defaults to configured QoS)
+
+        Returns:
+            True if every message was queued successfully.
+        """
+        if self._client is None or not self.is_connected:
+            logger.warning("Cannot publish batch: not connected")
+            return False
+
+        prepared = [
+            (topic, _dumps(payload) if isinstance(payload, dict) else payload, retain)
+            for topic, payload, retain in messages
+        ]
+        qos = qos if qos is not None else self.config.qos
+
+        publish = self._client.publish
+        results = [
+            publish(topic, payload, qos=qos, retain=retain) for topic, payload, retain in prepared
+        ]
+
+        success = True
+        for (topic, _, _), result in zip(prepared, results, strict=True):
+            if result.rc:  # MQTT_ERR_SUCCESS is 0
+                logger.warning(f"Failed to publish to {topic}: {result.rc}")
+                success = False
+        return success
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _device_topics(base: str, device_id: str) -> tuple[str, str]:
+        """Get the (state, availability) topics for a device."""
+        return (
+            TOPIC_DEVICE_STATE.format(base=base, device_id=device_id),
+            TOPIC_DEVICE_AVAILABILITY.format(base=base, device_id=device_id),
+        )
+
+    def device_state_topic(self, device_id: str) -> str:
+        """Get the state topic for a device."""
+        return self._device_topics(self.base_topic, device_id)[0]
+
+    def device_availability_topic(self, device_id: str) -> str:
+        """Get the availability topic for a device."""
+        return self._device_topics(self.base_topic, device_id)[1]
+
     def publish_bridge_state(self, state: str) -> bool:
         """Publish bridge availability state."""
-        topic = TOPIC_BRIDGE_STATE.format(base=self.base_topic)
-        return self.publish(topic, state, retain=True)
+        return self.publish(self._bridge_state_topic, state, retain=True)
 
     def publish_device_state(
         self,
@@ -247,11 +320,7 @@ class MqttClient:
         state: dict[str, Any],
     ) -> bool:
         """Publish device state data."""
-        topic = TOPIC_DEVICE_STATE.format(
-            base=self.base_topic,
-            device_id=device_id,
-        )
-        return self.publish(topic, state, retain=True)
+        return self.publish(self.device_state_topic(device_id), state, retain=True)
 
     def publish_device_availability(
         self,
@@ -259,11 +328,7 @@ class MqttClient:
         status: str,
     ) -> bool:
         """Publish device availability status."""
-        topic = TOPIC_DEVICE_AVAILABILITY.format(
-            base=self.base_topic,
-            device_id=device_id,
-        )
-        return self.publish(topic, status, retain=True)
+        return self.publish(self.device_availability_topic(device_id), status, retain=True)
 
     def publish_ha_discovery(
         self,
@@ -276,6 +341,17 @@ class MqttClient:
         topic = f"{discovery_prefix}/{component}/{object_id}/config"
         return self.publish(topic, config, retain=True)
 
+    def publish_ha_discovery_batch(
+        self,
+        entries: Iterable[DiscoveryEntry],
+        discovery_prefix: str = "homeassistant",
+    ) -> bool:
+        """Publish several Home Assistant discovery configs back-to-back."""
+        return self.publish_batch(
+            (f"{discovery_prefix}/{component}/{object_id}/config", config, True)
+            for component, object_id, config in entries
+        )
+
     def remove_ha_discovery(
         self,
         component: str,
@@ -285,3 +361,14 @@ class MqttClient:
         """Remove Home Assistant discovery config."""
         topic = f"{discovery_prefix}/{component}/{object_id}/config"
         return self.publish(topic, "", retain=True)
+
+    def remove_ha_discovery_batch(
+        self,
+        entities: Iterable[tuple[str, str]],
+        discovery_prefix: str = "homeassistant",
+    ) -> bool:
+        """Remove several Home Assistant discovery configs back-to-back."""
+        return self.publish_batch(
+            (f"{discovery_prefix}/{component}/{object_id}/config", "", True)
+            for component, object_id in entities
+        )
@@ -17,6 +17,9 @@ if TYPE_CHECKING:
 
 logger = get_logger("mqtt.commands")
 
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR"})
+_POLL_INTERVAL_RANGE = range(10, 3601)
+
 
 class CommandHandler:
     """Handles MQTT command messages."""
@@ -59,9 +62,8 @@ class CommandHandler:
     def _handle_log_level(self, topic: str, payload: str) -> None:
         """Handle log level change command."""
         level = payload.strip().upper()
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR"]
 
-        if level not in valid_levels:
+        if level not in _VALID_LOG_LEVELS:
             logger.warning(f"Invalid log level: {level}")
             return
 
@@ -76,7 +78,7 @@ class CommandHandler:
             logger.warning(f"Invalid poll interval: {payload}")
             return
 
-        if interval < 10 or interval > 3600:
+        if interval not in _POLL_INTERVAL_RANGE:
             logger.warning(f"Poll interval out of range: {interval}")
             return
 
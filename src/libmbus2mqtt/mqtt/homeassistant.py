@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+import json
+import threading
+from collections import defaultdict
+from collections.abc import Mapping
+from functools import cached_property, lru_cache
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
 
 from libmbus2mqtt.constants import (
@@ -9,8 +15,6 @@ from libmbus2mqtt.constants import (
     APP_VERSION,
     HA_DEFAULT_DISCOVERY_PREFIX,
     TOPIC_BRIDGE_STATE,
-    TOPIC_DEVICE_AVAILABILITY,
-    TOPIC_DEVICE_STATE,
 )
 from libmbus2mqtt.logging import get_logger
 from libmbus2mqtt.templates import get_template_for_device
@@ -18,13 +22,70 @@ from libmbus2mqtt.templates import get_template_for_device
 if TYPE_CHECKING:
     from libmbus2mqtt.config import HomeAssistantConfig
     from libmbus2mqtt.models.device import Device
-    from libmbus2mqtt.mqtt.client import MqttClient
+    from libmbus2mqtt.mqtt.client import DiscoveryEntry, MqttClient
 
 logger = get_logger("mqtt.homeassistant")
 
 # Bridge device identifier
 BRIDGE_DEVICE_ID = f"{APP_NAME}_bridge"
 
+# Bridge sensors, all reading from the bridge info topic
+_BRIDGE_SENSOR_SPECS: tuple[Mapping[str, Any], ...] = tuple(
+    MappingProxyType(spec)
+    for spec in (
+        {
+            "object_id": f"{BRIDGE_DEVICE_ID}_discovered_devices",
+            "name": "Discovered Devices",
+            "value_template": "{{ value_json.discovered_devices }}",
+            "icon": "mdi:devices",
+        },
+        {
+            "object_id": f"{BRIDGE_DEVICE_ID}_online_devices",
+            "name": "Online Devices",
+            "value_template": "{{ value_json.online_devices }}",
+            "icon": "mdi:check-network",
+        },
+        {
+            "object_id": f"{BRIDGE_DEVICE_ID}_version",
+            "name": "Firmware Version",
+            "value_template": "{{ value_json.version }}",
+            "icon": "mdi:tag",
+            "entity_category": "diagnostic",
+        },
+        {
+            "object_id": f"{BRIDGE_DEVICE_ID}_last_scan",
+            "name": "Last Scan",
+            "value_template": "{{ value_json.last_scan }}",
+            "icon": "mdi:update",
+            "entity_category": "diagnostic",
+            "enabled_by_default": False,
+        },
+        {
+            "object_id": f"{BRIDGE_DEVICE_ID}_uptime",
+            "name": "Uptime",
+            "value_template": "{{ value_json.uptime }}",
+            "icon": "mdi:timer-outline",
+            "entity_category": "diagnostic",
+            "enabled_by_default": False,
+        },
+        {
+            "object_id": f"{BRIDGE_DEVICE_ID}_last_poll_duration",
+            "name": "Last Poll Duration",
+            "value_template": "{{ value_json.last_poll_duration_ms }}",
+            "unit_of_measurement": "ms",
+            "icon": "mdi:timer",
+            "entity_category": "diagnostic",
+            "enabled_by_default": False,
+        },
+    )
+)
+
+
+@lru_cache(maxsize=4096)
+def _record_value_template(record_key: str) -> str:
+    """Get the HA value template reading a data record's value from the device state."""
+    return f"{{{{ value_json.records['{record_key}'].value }}}}"
+
 
 def get_bridge_device_info() -> dict[str, Any]:
     """Get device info for the bridge device."""
@@ -67,7 +128,15 @@ class HomeAssistantDiscovery:
     ) -> None:
         self.mqtt = mqtt_client
         self.config = config
-        self._published_entities: set[str] = set()
+        self._bridge_state_topic = TOPIC_BRIDGE_STATE.format(base=mqtt_client.base_topic)
+        # component -> object_id -> hash of the last config published for it
+        self._published_entities: defaultdict[str, dict[str, int | None]] = defaultdict(dict)
+        self._device_availability: dict[str, list[dict[str, str]]] = {}
+        # Queued (component, object_id, payload, hash) entries awaiting flush()
+        self._pending: list[tuple[str, str, str, int]] = []
+        # Discovery is published from both the poll loop and paho's network thread
+        # (on reconnect), so the queue and published hashes are only touched under this lock
+        self._lock = threading.Lock()
 
     @property
     def discovery_prefix(self) -> str:
@@ -88,74 +157,10 @@ class HomeAssistantDiscovery:
 
         bridge_device = get_bridge_device_info()
         base = self.base_topic
+        info_topic = f"{base}/bridge/info"
 
-        # Discovered Devices sensor
-        self._publish_sensor(
-            object_id=f"{BRIDGE_DEVICE_ID}_discovered_devices",
-            name="Discovered Devices",
-            device=bridge_device,
-            state_topic=f"{base}/bridge/info",
-            value_template="{{ value_json.discovered_devices }}",
-            icon="mdi:devices",
-        )
-
-        # Online Devices sensor
-        self._publish_sensor(
-            object_id=f"{BRIDGE_DEVICE_ID}_online_devices",
-            name="Online Devices",
-            device=bridge_device,
-            state_topic=f"{base}/bridge/info",
-            value_template="{{ value_json.online_devices }}",
-            icon="mdi:check-network",
-        )
-
-        # Firmware Version sensor
-        self._publish_sensor(
-            object_id=f"{BRIDGE_DEVICE_ID}_version",
-            name="Firmware Version",
-            device=bridge_device,
-            state_topic=f"{base}/bridge/info",
-            value_template="{{ value_json.version }}",
-            icon="mdi:tag",
-            entity_category="diagnostic",
-        )
-
-        # Last Scan sensor (disabled by default)
-        self._publish_sensor(
-            object_id=f"{BRIDGE_DEVICE_ID}_last_scan",
-            name="Last Scan",
-            device=bridge_device,
-            state_topic=f"{base}/bridge/info",
-            value_template="{{ value_json.last_scan }}",
-            icon="mdi:update",
-            entity_category="diagnostic",
-            enabled_by_default=False,
-        )
-
-        # Uptime sensor (disabled by default)
-        self._publish_sensor(
-            object_id=f"{BRIDGE_DEVICE_ID}_uptime",
-            name="Uptime",
-            device=bridge_device,
-            state_topic=f"{base}/bridge/info",
-            value_template="{{ value_json.uptime }}",
-            icon="mdi:timer-outline",
-            entity_category="diagnostic",
-            enabled_by_default=False,
-        )
-
-        # Last Poll Duration sensor (disabled by default)
-        self._publish_sensor(
-            object_id=f"{BRIDGE_DEVICE_ID}_last_poll_duration",
-            name="Last Poll Duration",
-            device=bridge_device,
-            state_topic=f"{base}/bridge/info",
-            value_template="{{ value_json.last_poll_duration_ms }}",
-            unit_of_measurement="ms",
-            icon="mdi:timer",
-            entity_category="diagnostic",
-            enabled_by_default=False,
-        )
+        for spec in _BRIDGE_SENSOR_SPECS:
+            self._publish_sensor(**spec, device=bridge_device, state_topic=info_topic)
 
         # Rescan Devices button
         self._publish_button(
@@ -172,7 +177,7 @@ class HomeAssistantDiscovery:
             name="Log Level",
             device=bridge_device,
             command_topic=f"{base}/command/log_level",
-            state_topic=f"{base}/bridge/info",
+            state_topic=info_topic,
             value_template="{{ value_json.log_level }}",
             options=["DEBUG", "INFO", "WARNING", "ERROR"],
             icon="mdi:text-box-outline",
@@ -185,7 +190,7 @@ class HomeAssistantDiscovery:
             name="Poll Interval",
             device=bridge_device,
             command_topic=f"{base}/command/poll_interval",
-            state_topic=f"{base}/bridge/info",
+            state_topic=info_topic,
             value_template="{{ value_json.poll_interval }}",
             min_value=10,
             max_value=3600,
@@ -195,6 +200,8 @@ class HomeAssistantDiscovery:
             entity_category="config",
         )
 
+        self.flush()
+
     def publish_device_discovery(self, device: Device) -> None:
         """Publish HA discovery configs for an M-Bus device."""
         if not self.config.enabled:
@@ -203,12 +210,10 @@ class HomeAssistantDiscovery:
         logger.info(f"Publishing HA discovery for device ID {device.address}: {device.name}")
 
         device_info = get_mbus_device_info(device)
-        base = self.base_topic
-        device_id = device.object_id
 
         # State/availability topics for this device
-        state_topic = TOPIC_DEVICE_STATE.format(base=base, device_id=device_id)
-        availability_topic = TOPIC_DEVICE_AVAILABILITY.format(base=base, device_id=device_id)
+        state_topic = self.mqtt.device_state_topic(device.object_id)
+        availability_topic = self.mqtt.device_availability_topic(device.object_id)
         availability_list = self._build_device_availability_list(availability_topic)
 
         # Try to load a template for this device
@@ -237,24 +242,27 @@ class HomeAssistantDiscovery:
                 availability=availability_list,
             )
 
+        self.flush()
         device.ha_discovery_published = True
 
     def _publish_template_entities(
         self,
         device: Device,
         device_info: dict[str, Any],
-        template: dict[str, dict[str, str]],
+        template: Mapping[str, Mapping[str, str]],
         state_topic: str,
         availability: list[dict[str, str]],
     ) -> None:
         """Publish entities defined in a device template."""
+        prefix = f"{APP_NAME}_{device.object_id}_"
+        queue = self._queue_discovery
         for entity_id, entity_config in template.items():
             component = (
                 entity_config.get("component")
                 or entity_config.get("platform")  # support legacy key used in templates
                 or "sensor"
             )
-            object_id = f"{APP_NAME}_{device.object_id}_{entity_id}"
+            object_id = prefix + entity_id
 
             config: dict[str, Any] = {
                 "name": entity_config.get("name", entity_id),
@@ -276,13 +284,7 @@ class HomeAssistantDiscovery:
             config["state_topic"] = state_topic
             config["availability"] = availability
 
-            self.mqtt.publish_ha_discovery(
-                component=component,
-                object_id=object_id,
-                config=config,
-                discovery_prefix=self.discovery_prefix,
-            )
-            self._published_entities.add(f"{component}/{object_id}")
+            queue(component, object_id, config)
 
     def _publish_generic_entities(
         self,
@@ -296,50 +298,95 @@ class HomeAssistantDiscovery:
             logger.warning(f"No M-Bus data for device ID {device.address} ({device.name})")
             return
 
+        prefix = f"{APP_NAME}_{device.object_id}_"
+        queue = self._queue_discovery
         for record_key, record in device.mbus_data.data_records.items():
             if record.value is None:
                 continue
 
             # Create sensor for each data record
             record_id = f"record_{record_key}" if record_key else f"func_{record.function}"
-            object_id = f"{APP_NAME}_{device.object_id}_{record_id}"
+            object_id = prefix + record_id
 
             config: dict[str, Any] = {
                 "name": record.function or f"Record {record_key}",
                 "unique_id": object_id,
                 "device": device_info,
                 "state_topic": state_topic,
-                "value_template": f"{{{{ value_json.records['{record_key}'].value }}}}",
+                "value_template": _record_value_template(record_key),
                 "availability": availability,
             }
 
             if record.unit:
                 config["unit_of_measurement"] = record.unit
 
-            self.mqtt.publish_ha_discovery(
-                component="sensor",
-                object_id=object_id,
-                config=config,
-                discovery_prefix=self.discovery_prefix,
-            )
-            self._published_entities.add(f"sensor/{object_id}")
+            queue("sensor", object_id, config)
+
+    def _queue_discovery(self, component: str, object_id: str, config: dict[str, Any]) -> None:
+        """Queue a discovery config to be sent with the next flush, unless unchanged."""
+        # Serialized once: the same string is hashed and then published as-is
+        payload = json.dumps(config, sort_keys=True)
+        config_hash = hash(payload)
+        with self._lock:
+            if self._published_entities[component].get(object_id) == config_hash:
+                return
+            self._pending.append((component, object_id, payload, config_hash))
+
+    def flush(self) -> bool:
+        """Publish all queued discovery configs in a single batch."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return True
+
+        entries: list[DiscoveryEntry] = [
+            (component, object_id, payload) for component, object_id, payload, _ in pending
+        ]
+        success = self.mqtt.publish_ha_discovery_batch(
+            entries, discovery_prefix=self.discovery_prefix
+        )
 
-    def _build_device_availability_list(
-        self, device_availability_topic: str
-    ) -> list[dict[str, str]]:
-        """Build HA availability list combining bridge and device availability topics."""
-        return [
+        # On failure keep the entities known for removal, but resend them next time
+        with self._lock:
+            published = self._published_entities
+            for component, object_id, _, config_hash in pending:
+                published[component][object_id] = config_hash if success else None
+        return success
+
+    def mark_stale(self) -> None:
+        """Force every published config to be resent, e.g. after reconnecting to the broker."""
+        with self._lock:
+            for object_ids in self._published_entities.values():
+                for object_id in object_ids:
+                    object_ids[object_id] = None
+
+    @cached_property
+    def _bridge_availability(self) -> tuple[dict[str, str], ...]:
+        """HA availability entry for the bridge state topic, shared by all bridge entities."""
+        return (
             {
-                "topic": TOPIC_BRIDGE_STATE.format(base=self.base_topic),
+                "topic": self._bridge_state_topic,
                 "payload_available": "online",
                 "payload_not_available": "offline",
             },
-            {
-                "topic": device_availability_topic,
-                "payload_available": "online",
-                "payload_not_available": "offline",
-            },
-        ]
+        )
+
+    def _build_device_availability_list(
+        self, device_availability_topic: str
+    ) -> list[dict[str, str]]:
+        """Build HA availability list combining bridge and device availability topics."""
+        cached = self._device_availability.get(device_availability_topic)
+        if cached is None:
+            cached = [
+                *self._bridge_availability,
+                {
+                    "topic": device_availability_topic,
+                    "payload_available": "online",
+                    "payload_not_available": "offline",
+                },
+            ]
+            self._device_availability[device_availability_topic] = cached
+        return cached
 
     def _publish_sensor(
         self,
@@ -362,13 +409,7 @@ class HomeAssistantDiscovery:
             "device": device,
             "state_topic": state_topic,
             "value_template": value_template,
-            "availability": [
-                {
-                    "topic": TOPIC_BRIDGE_STATE.format(base=self.base_topic),
-                    "payload_available": "online",
-                    "payload_not_available": "offline",
-                }
-            ],
+            "availability": list(self._bridge_availability),
         }
 
         if icon:
@@ -384,13 +425,7 @@ class HomeAssistantDiscovery:
         if not enabled_by_default:
             config["enabled_by_default"] = False
 
-        self.mqtt.publish_ha_discovery(
-            component="sensor",
-            object_id=object_id,
-            config=config,
-            discovery_prefix=self.discovery_prefix,
-        )
-        self._published_entities.add(f"sensor/{object_id}")
+        self._queue_discovery("sensor", object_id, config)
 
     def _publish_button(
         self,
@@ -407,13 +442,7 @@ class HomeAssistantDiscovery:
             "unique_id": object_id,
             "device": device,
             "command_topic": command_topic,
-            "availability": [
-                {
-                    "topic": TOPIC_BRIDGE_STATE.format(base=self.base_topic),
-                    "payload_available": "online",
-                    "payload_not_available": "offline",
-                }
-            ],
+            "availability": list(self._bridge_availability),
         }
 
         if icon:
@@ -421,13 +450,7 @@ class HomeAssistantDiscovery:
         if entity_category:
             config["entity_category"] = entity_category
 
-        self.mqtt.publish_ha_discovery(
-            component="button",
-            object_id=object_id,
-            config=config,
-            discovery_prefix=self.discovery_prefix,
-        )
-        self._published_entities.add(f"button/{object_id}")
+        self._queue_discovery("button", object_id, config)
 
     def _publish_select(
         self,
@@ -450,13 +473,7 @@ class HomeAssistantDiscovery:
             "state_topic": state_topic,
             "value_template": value_template,
             "options": options,
-            "availability": [
-                {
-                    "topic": TOPIC_BRIDGE_STATE.format(base=self.base_topic),
-                    "payload_available": "online",
-                    "payload_not_available": "offline",
-                }
-            ],
+            "availability": list(self._bridge_availability),
         }
 
         if icon:
@@ -464,13 +481,7 @@ class HomeAssistantDiscovery:
         if entity_category:
             config["entity_category"] = entity_category
 
-        self.mqtt.publish_ha_discovery(
-            component="select",
-            object_id=object_id,
-            config=config,
-            discovery_prefix=self.discovery_prefix,
-        )
-        self._published_entities.add(f"select/{object_id}")
+        self._queue_discovery("select", object_id, config)
 
     def _publish_number(
         self,
@@ -498,13 +509,7 @@ class HomeAssistantDiscovery:
             "min": min_value,
             "max": max_value,
             "step": step,
-            "availability": [
-                {
-                    "topic": TOPIC_BRIDGE_STATE.format(base=self.base_topic),
-                    "payload_available": "online",
-                    "payload_not_available": "offline",
-                }
-            ],
+            "availability": list(self._bridge_availability),
         }
 
         if unit_of_measurement:
@@ -514,24 +519,18 @@ class HomeAssistantDiscovery:
         if entity_category:
             config["entity_category"] = entity_category
 
-        self.mqtt.publish_ha_discovery(
-            component="number",
-            object_id=object_id,
-            config=config,
-            discovery_prefix=self.discovery_prefix,
-        )
-        self._published_entities.add(f"number/{object_id}")
+        self._queue_discovery("number", object_id, config)
 
     def remove_all_discovery(self) -> None:
         """Remove all published HA discovery configs."""
         logger.info("Removing all Home Assistant discovery configs")
 
-        for entity_key in self._published_entities:
-            component, object_id = entity_key.split("/", 1)
-            self.mqtt.remove_ha_discovery(
-                component=component,
-                object_id=object_id,
-                discovery_prefix=self.discovery_prefix,
-            )
-
-        self._published_entities.clear()
+        with self._lock:
+            entities = [
+                (component, object_id)
+                for component, object_ids in self._published_entities.items()
+                for object_id in object_ids
+            ]
+            self._published_entities.clear()
+        if entities:
+            self.mqtt.remove_ha_discovery_batch(entities, discovery_prefix=self.discovery_prefix)
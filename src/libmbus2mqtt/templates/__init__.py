@@ -3,66 +3,197 @@
 from __future__ import annotations
 
 import json
+import sys
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
 from importlib import resources
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, cast
 
+try:
+    import orjson
+
+    _loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+
 from libmbus2mqtt.constants import TEMPLATES_DIR
 from libmbus2mqtt.logging import get_logger
 
 logger = get_logger("templates")
 
-# Cache for loaded templates
-_template_cache: dict[str, dict[str, Any]] = {}
-_user_index_cache: dict[str, dict[str, str | None]] | None = None
-_bundled_index_cache: dict[str, dict[str, str | None]] | None = None
+# Loaded template: entity id -> entity config (read-only)
+Template = Mapping[str, Any]
+# Raw index.json content: filename -> match criteria
+TemplateIndex = dict[str, dict[str, str | None]]
+# Manufacturer -> ProductName -> filename; the None slot holds the wildcard entry
+IndexTree = dict[str, dict[str | None, str]]
 
 
-def _get_bundled_templates_path() -> Path:
-    """Get path to bundled templates."""
-    return Path(resources.files("libmbus2mqtt") / "templates")  # type: ignore[arg-type]
+@dataclass
+class _CacheState:
+    """
+    Loaded templates and indexes.
 
+    Lazy loading fills the fields and clear_cache() resets them, both while
+    holding _lock.
+    """
 
-def _load_index_file(path: Path) -> dict[str, dict[str, str | None]]:
+    templates: dict[str, Template] = field(default_factory=dict)
+    bundled_templates: dict[str, Template] | None = None
+    bundled_index: IndexTree | None = None
+    # User entries merged over bundled ones
+    index: IndexTree | None = None
+    # Bumped on every clear, so lookups and loads started before it are never cached
+    generation: int = 0
+
+
+_cache = _CacheState()
+
+# Bundled template locations, resolved once
+_BUNDLED_TEMPLATES_PATH = Path(str(resources.files("libmbus2mqtt") / "templates"))
+_BUNDLED_INDEX_PATH = _BUNDLED_TEMPLATES_PATH / "index.json"
+
+# Serializes lazy loading and cache replacement
+_lock = threading.Lock()
+
+
+def _freeze_entity(entity: Any) -> Any:
+    """Wrap an entity config in a read-only view with interned keys and string values."""
+    if not isinstance(entity, dict):
+        return entity
+    # Deeper values are left as parsed so configs built from them stay JSON-serializable
+    return MappingProxyType(
+        {
+            sys.intern(key): sys.intern(value) if isinstance(value, str) else value
+            for key, value in entity.items()
+        }
+    )
+
+
+def _load_template_file(path: Path) -> Template:
+    """Load a template file, wrapping it and its entity configs in read-only views."""
+    template = _loads(path.read_bytes())
+    if isinstance(template, dict):
+        return MappingProxyType(
+            {sys.intern(key): _freeze_entity(entity) for key, entity in template.items()}
+        )
+    return cast(Template, template)
+
+
+def _get_bundled_templates() -> dict[str, Template]:
+    """Load every bundled template on first use."""
+    bundled = _cache.bundled_templates
+    if bundled is not None:
+        return bundled
+
+    with _lock:
+        if _cache.bundled_templates is None:
+            bundled_templates: dict[str, Template] = {}
+            # glob() yields nothing for a missing directory, so no separate is_dir() probe
+            for path in sorted(_BUNDLED_TEMPLATES_PATH.glob("*.json")):
+                if path.name != "index.json":
+                    bundled_templates[path.name] = _load_template_file(path)
+            logger.debug("Preloaded %d bundled templates", len(bundled_templates))
+            _cache.bundled_templates = bundled_templates
+        return _cache.bundled_templates
+
+
+def _load_index_file(path: Path) -> TemplateIndex:
     """Load an index file from the given path."""
-    with path.open() as f:
-        return cast(dict[str, dict[str, str | None]], json.load(f))
+    return cast(TemplateIndex, _loads(path.read_bytes()))
 
 
-def _get_user_index() -> dict[str, dict[str, str | None]]:
-    """Load user template index (if present)."""
-    global _user_index_cache
-    if _user_index_cache is not None:
-        return _user_index_cache
+def _build_index_tree(index: TemplateIndex) -> IndexTree:
+    """Nest index entries by manufacturer, then product name."""
+    tree: IndexTree = {}
+    for filename, match_criteria in index.items():
+        manufacturer = match_criteria.get("Manufacturer")
+        if manufacturer is None:
+            continue
+        # Within one index file the earliest entry for a manufacturer/product pair wins;
+        # user-over-bundled precedence is decided later by _merge_indexes
+        tree.setdefault(manufacturer, {}).setdefault(match_criteria.get("ProductName"), filename)
+    return tree
 
-    user_index = TEMPLATES_DIR / "index.json"
-    if user_index.exists():
-        logger.debug(f"Loading template index from {user_index}")
-        _user_index_cache = _load_index_file(user_index)
-    else:
-        _user_index_cache = {}
-    return _user_index_cache
 
+def _match_index(tree: IndexTree, manufacturer: str, product_name: str | None) -> str | None:
+    """Return the filename matching manufacturer and product, specific products first."""
+    branch = tree.get(manufacturer)
+    if branch is None:
+        return None
+    filename = branch.get(product_name)
+    return filename if filename is not None else branch.get(None)
 
-def _get_bundled_index() -> dict[str, dict[str, str | None]]:
-    """Load bundled template index (if present)."""
-    global _bundled_index_cache
-    if _bundled_index_cache is not None:
-        return _bundled_index_cache
 
-    bundled_index = _get_bundled_templates_path() / "index.json"
-    if bundled_index.exists():
-        logger.debug("Loading template index from bundled templates")
-        _bundled_index_cache = _load_index_file(bundled_index)
-    else:
-        _bundled_index_cache = {}
-    return _bundled_index_cache
+def _read_user_index() -> IndexTree:
+    """Read the user template index (if present)."""
+    user_index = TEMPLATES_DIR / "index.json"
+    try:
+        index = _load_index_file(user_index)
+    except FileNotFoundError:
+        return {}
+    logger.debug("Loaded template index from %s", user_index)
+    return _build_index_tree(index)
+
+
+def _read_bundled_index() -> IndexTree:
+    """Read the bundled template index (if present)."""
+    try:
+        index = _load_index_file(_BUNDLED_INDEX_PATH)
+    except FileNotFoundError:
+        return {}
+    logger.debug("Loaded template index from bundled templates")
+    return _build_index_tree(index)
+
+
+def _merge_indexes(user: IndexTree, bundled: IndexTree) -> IndexTree:
+    """Merge index trees so user entries shadow bundled ones."""
+    merged = {manufacturer: dict(branch) for manufacturer, branch in bundled.items()}
+    for manufacturer, user_branch in user.items():
+        if None in user_branch:
+            # A user wildcard covers every product, so bundled entries must not win
+            merged[manufacturer] = dict(user_branch)
+        else:
+            merged.setdefault(manufacturer, {}).update(user_branch)
+    return merged
+
+
+def _get_index() -> IndexTree:
+    """Load the merged user and bundled template index on first use."""
+    index = _cache.index
+    if index is not None:
+        return index
+
+    with _lock:
+        if _cache.index is None:
+            if _cache.bundled_index is None:
+                _cache.bundled_index = _read_bundled_index()
+            _cache.index = _merge_indexes(_read_user_index(), _cache.bundled_index)
+        return _cache.index
+
+
+@lru_cache(maxsize=256)
+def _find_template(generation: int, manufacturer: str, product_name: str | None) -> str | None:
+    """Match a device against the index, memoized per cache generation."""
+    filename = _match_index(_get_index(), manufacturer, product_name)
+    if filename is not None:
+        logger.debug("Matched template %s for %s/%s", filename, manufacturer, product_name)
+        return filename
+
+    logger.warning("No template found for %s/%s", manufacturer, product_name)
+    return None
 
 
 def find_template(manufacturer: str, product_name: str | None) -> str | None:
     """
     Find matching template filename for a device.
 
+    Results, including misses, are memoized until the cache is cleared.
+
     Args:
         manufacturer: Device manufacturer code
         product_name: Device product name (can be None)
@@ -70,34 +201,32 @@ def find_template(manufacturer: str, product_name: str | None) -> str | None:
     Returns:
         Template filename or None if no match
     """
-    # Try user index first
-    user_index = _get_user_index()
-    for filename, match_criteria in user_index.items():
-        if match_criteria.get("Manufacturer") != manufacturer:
-            continue
-
-        expected_product = match_criteria.get("ProductName")
-        if expected_product is None or expected_product == product_name:
-            logger.debug(f"Matched user template {filename} for {manufacturer}/{product_name}")
-            return filename
+    return _find_template(_cache.generation, manufacturer, product_name)
 
-    # Fall back to bundled index
-    bundled_index = _get_bundled_index()
 
-    for filename, match_criteria in bundled_index.items():
-        if match_criteria.get("Manufacturer") != manufacturer:
-            continue
+def _read_template(filename: str) -> Template | None:
+    """Read a template from the user directory, falling back to bundled templates."""
+    # Try user templates first
+    user_template = TEMPLATES_DIR / filename
+    try:
+        template = _load_template_file(user_template)
+    except FileNotFoundError:
+        pass
+    else:
+        logger.debug("Loaded template from %s", user_template)
+        return template
 
-        expected_product = match_criteria.get("ProductName")
-        if expected_product is None or expected_product == product_name:
-            logger.debug(f"Matched bundled template {filename} for {manufacturer}/{product_name}")
-            return filename
+    # Fall back to bundled templates (preloaded)
+    bundled_template = _get_bundled_templates().get(filename)
+    if bundled_template is not None:
+        logger.debug("Using bundled template: %s", filename)
+        return bundled_template
 
-    logger.warning(f"No template found for {manufacturer}/{product_name}")
+    logger.warning("Template not found: %s", filename)
     return None
 
 
-def load_template(filename: str) -> dict[str, Any] | None:
+def load_template(filename: str) -> Template | None:
     """
     Load a template by filename.
 
@@ -107,34 +236,26 @@ def load_template(filename: str) -> dict[str, Any] | None:
         filename: Template filename (e.g., "itron_cyble_1_4.json")
 
     Returns:
-        Template dict or None if not found
+        Read-only template mapping or None if not found
     """
-    if filename in _template_cache:
-        return _template_cache[filename]
-
-    # Try user templates first
-    user_template = TEMPLATES_DIR / filename
-    if user_template.exists():
-        logger.debug(f"Loading template from {user_template}")
-        with user_template.open() as f:
-            template: dict[str, Any] = json.load(f)
-            _template_cache[filename] = template
-            return template
-
-    # Fall back to bundled templates
-    bundled_template = _get_bundled_templates_path() / filename
-    if bundled_template.exists():
-        logger.debug(f"Loading template from bundled: {filename}")
-        with bundled_template.open() as f:
-            template = json.load(f)
-            _template_cache[filename] = template
+    cached = _cache.templates.get(filename)
+    if cached is not None:
+        return cached
+
+    # Read outside the lock; the generation tells whether a clear happened meanwhile
+    generation = _cache.generation
+    template = _read_template(filename)
+    if template is None:
+        return None
+    with _lock:
+        if _cache.generation != generation:
+            # Read before the clear, so it must not land in the fresh cache
             return template
-
-    logger.warning(f"Template not found: {filename}")
-    return None
+        # Concurrent loaders all get whichever copy was stored first
+        return _cache.templates.setdefault(filename, template)
 
 
-def get_template_for_device(manufacturer: str, product_name: str | None) -> dict[str, Any] | None:
+def get_template_for_device(manufacturer: str, product_name: str | None) -> Template | None:
     """
     Get template for a device by manufacturer and product name.
 
@@ -143,7 +264,7 @@ def get_template_for_device(manufacturer: str, product_name: str | None) -> dict
         product_name: Device product name (can be None)
 
     Returns:
-        Template dict or None if no match
+        Read-only template mapping or None if no match
     """
     filename = find_template(manufacturer, product_name)
     if filename is None:
@@ -151,9 +272,28 @@ def get_template_for_device(manufacturer: str, product_name: str | None) -> dict
     return load_template(filename)
 
 
+def _reset_cache(keep_bundled: bool) -> None:
+    """Reset the template caches in place; the caller must hold _lock."""
+    _cache.templates = {}
+    _cache.index = None
+    if not keep_bundled:
+        _cache.bundled_templates = None
+        _cache.bundled_index = None
+    _cache.generation += 1
+    _find_template.cache_clear()
+
+
 def clear_cache() -> None:
     """Clear template caches."""
-    global _template_cache, _user_index_cache, _bundled_index_cache
-    _template_cache = {}
-    _user_index_cache = None
-    _bundled_index_cache = None
+    with _lock:
+        _reset_cache(keep_bundled=False)
+
+
+def _clear_user_cache() -> None:
+    """Clear user template caches, keeping the bundled templates and index loaded (tests)."""
+    with _lock:
+        _reset_cache(keep_bundled=True)
+
+
+# Bundled templates ship with the package and never change, so load them up front
+_get_bundled_templates()
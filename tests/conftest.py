@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from helpers import MqttSpy
 
 from libmbus2mqtt.config import (
     AppConfig,
@@ -18,7 +20,7 @@ from libmbus2mqtt.config import (
 )
 from libmbus2mqtt.mbus.parser import parse_xml
 from libmbus2mqtt.models.device import Device
-from libmbus2mqtt.models.mbus import MbusData
+from libmbus2mqtt.models.mbus import DataRecord, MbusData, SlaveInformation
 
 # Path to fixtures directory
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
@@ -29,50 +31,51 @@ FIXTURES_DIR = Path(__file__).parent / "fixtures"
 # ============================================================================
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fixtures_dir() -> Path:
     """Return path to fixtures directory."""
     return FIXTURES_DIR
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def apator_xml() -> str:
     """Load Apator APT-MBUS-NA-1 XML fixture."""
     return (FIXTURES_DIR / "apator_apt-mbus-na-1.xml").read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def itron_xml() -> str:
     """Load Itron Cyble XML fixture."""
     return (FIXTURES_DIR / "itron_cyble.xml").read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def kamstrup_xml() -> str:
     """Load Kamstrup Multical 401 XML fixture."""
     return (FIXTURES_DIR / "kamstrup_multical_401.xml").read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def bmeters_xml() -> str:
     """Load B Meters FRM-MB1 (ZRI) XML fixture."""
     return (FIXTURES_DIR / "bmeters_frm_mb1.xml").read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def zenner_xml() -> str:
     """Load Zenner EDC (ZRI) XML fixture."""
     return (FIXTURES_DIR / "zenner_edc.xml").read_text()
 
 
 @pytest.fixture(
+    scope="session",
     params=[
         ("apator", "apator_apt-mbus-na-1.xml"),
         ("itron", "itron_cyble.xml"),
         ("kamstrup", "kamstrup_multical_401.xml"),
         ("bmeters", "bmeters_frm_mb1.xml"),
         ("zenner", "zenner_edc.xml"),
-    ]
+    ],
 )
 def all_xml_fixtures(request: pytest.FixtureRequest) -> tuple[str, str]:
     """Parametrized fixture yielding all XML fixtures with their names."""
@@ -86,31 +89,31 @@ def all_xml_fixtures(request: pytest.FixtureRequest) -> tuple[str, str]:
 # ============================================================================
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def apator_mbus_data(apator_xml: str) -> MbusData:
     """Parsed MbusData from Apator fixture."""
     return parse_xml(apator_xml)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def itron_mbus_data(itron_xml: str) -> MbusData:
     """Parsed MbusData from Itron fixture."""
     return parse_xml(itron_xml)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def kamstrup_mbus_data(kamstrup_xml: str) -> MbusData:
     """Parsed MbusData from Kamstrup fixture."""
     return parse_xml(kamstrup_xml)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def bmeters_mbus_data(bmeters_xml: str) -> MbusData:
     """Parsed MbusData from B Meters fixture."""
     return parse_xml(bmeters_xml)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def zenner_mbus_data(zenner_xml: str) -> MbusData:
     """Parsed MbusData from Zenner fixture."""
     return parse_xml(zenner_xml)
@@ -145,6 +148,27 @@ def minimal_app_config(
     )
 
 
+# Home Assistant configs are never mutated by tests, so they are built once
+
+
+@pytest.fixture(scope="session")
+def ha_config_enabled() -> HomeAssistantConfig:
+    """Home Assistant config with discovery enabled."""
+    return HomeAssistantConfig(enabled=True)
+
+
+@pytest.fixture(scope="session")
+def ha_config_disabled() -> HomeAssistantConfig:
+    """Home Assistant config with discovery disabled."""
+    return HomeAssistantConfig(enabled=False)
+
+
+@pytest.fixture(scope="session")
+def ha_config_custom_prefix() -> HomeAssistantConfig:
+    """Home Assistant config with custom discovery prefix."""
+    return HomeAssistantConfig(enabled=True, discovery_prefix="custom_prefix")
+
+
 @pytest.fixture
 def full_app_config() -> AppConfig:
     """Fully populated application configuration."""
@@ -201,28 +225,73 @@ def device_with_mbus_data(apator_mbus_data: MbusData) -> Device:
     return device
 
 
+@pytest.fixture(scope="session")
+def generic_mbus_data() -> MbusData:
+    """Minimal MbusData from a manufacturer without a template."""
+    return MbusData(
+        slave_information=SlaveInformation(
+            Id="123",
+            Manufacturer="UNKNOWN",
+            Version="1",
+            Medium="Water",
+        ),
+        data_records={
+            "0": DataRecord(
+                id="0",
+                Function="Volume",
+                Unit="m^3",
+                Value="12345",
+            )
+        },
+    )
+
+
+@pytest.fixture
+def itron_device(itron_mbus_data: MbusData) -> Device:
+    """Itron device (template available), built fresh per test from the shared data."""
+    device = Device(address=1)
+    device.update_from_mbus_data(itron_mbus_data)
+    return device
+
+
+@pytest.fixture
+def generic_device(generic_mbus_data: MbusData) -> Device:
+    """Device without a matching template, built fresh per test from the shared data."""
+    device = Device(address=1)
+    device.manufacturer = "UNKNOWN"
+    device.mbus_data = generic_mbus_data
+    return device
+
+
 # ============================================================================
 # Mock Fixtures
 # ============================================================================
 
 
 @pytest.fixture
-def mock_mqtt_client() -> MagicMock:
-    """Mock MQTT client for testing."""
-    client = MagicMock()
-    client.base_topic = "libmbus2mqtt"
-    client.is_connected = True
-    client.publish.return_value = True
-    client.publish_ha_discovery.return_value = True
-    client.publish_device_state.return_value = True
-    client.publish_device_availability.return_value = True
-    client.remove_ha_discovery.return_value = True
-    return client
+def mock_mqtt_client() -> MqttSpy:
+    """Spy MQTT client for testing."""
+    return MqttSpy()
+
+
+@pytest.fixture(scope="session")
+def mock_libmbus_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create mock libmbus serial and TCP binaries once for the whole session."""
+    path = tmp_path_factory.mktemp("libmbus")
+    for binary in [
+        "mbus-serial-scan",
+        "mbus-serial-request-data",
+        "mbus-tcp-scan",
+        "mbus-tcp-request-data",
+    ]:
+        (path / binary).touch()
+    return path
 
 
 @pytest.fixture
 def mock_subprocess(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
-    """Mock subprocess.run for M-Bus interface tests."""
+    """Mock subprocess.run for M-Bus interface tests, succeeding with empty output."""
     mock_run = MagicMock()
+    mock_run.return_value = subprocess.CompletedProcess([], 0, stdout="", stderr="")
     monkeypatch.setattr("subprocess.run", mock_run)
     return mock_run
@@ -0,0 +1,64 @@
+"""Test doubles and helpers shared across the test modules."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+from libmbus2mqtt.constants import TOPIC_DEVICE_AVAILABILITY, TOPIC_DEVICE_STATE
+
+
+def write_json(path: Path, obj: Any) -> None:
+    """Write obj to path as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj))
+    else:
+        path.write_text(json.dumps(obj))
+
+
+class MqttSpy:
+    """Minimal MQTT client stand-in that records Home Assistant discovery calls."""
+
+    def __init__(self) -> None:
+        self.base_topic = "libmbus2mqtt"
+        self.is_connected = True
+        self.batch_result = True
+        self.publish_ha_discovery_batch_calls: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+        self.remove_ha_discovery_batch_calls: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+
+    def device_state_topic(self, device_id: str) -> str:
+        return TOPIC_DEVICE_STATE.format(base=self.base_topic, device_id=device_id)
+
+    def device_availability_topic(self, device_id: str) -> str:
+        return TOPIC_DEVICE_AVAILABILITY.format(base=self.base_topic, device_id=device_id)
+
+    def publish_ha_discovery_batch(self, *args: Any, **kwargs: Any) -> bool:
+        self.publish_ha_discovery_batch_calls.append((args, kwargs))
+        return self.batch_result
+
+    def remove_ha_discovery_batch(self, *args: Any, **kwargs: Any) -> bool:
+        self.remove_ha_discovery_batch_calls.append((args, kwargs))
+        return True
+
+    def reset_mock(self) -> None:
+        self.publish_ha_discovery_batch_calls.clear()
+        self.remove_ha_discovery_batch_calls.clear()
+
+
+class PahoClientStub:
+    """Minimal paho Client stand-in that records publish calls."""
+
+    def __init__(self) -> None:
+        self.rc = 0
+        self.publish_calls: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+
+    def publish(self, *args: Any, **kwargs: Any) -> SimpleNamespace:
+        self.publish_calls.append((args, kwargs))
+        return SimpleNamespace(rc=self.rc)
@@ -0,0 +1,47 @@
+"""Tests for MQTT bridge command handling."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from libmbus2mqtt.mqtt.commands import CommandHandler
+
+
+class TestPollIntervalCommand:
+    """Tests for the poll interval command."""
+
+    @pytest.fixture
+    def handler(self) -> tuple[CommandHandler, MagicMock]:
+        """Command handler with a recording poll interval callback."""
+        handler = CommandHandler(MagicMock())
+        callback = MagicMock()
+        handler.on_poll_interval_change(callback)
+        return handler, callback
+
+    @pytest.mark.parametrize(
+        ("payload", "expected"),
+        [("30", 30), (" 30 ", 30), ("+30", 30), ("30\n", 30), ("10", 10), ("3600", 3600)],
+    )
+    def test_accepts_integer_payloads(
+        self,
+        handler: tuple[CommandHandler, MagicMock],
+        payload: str,
+        expected: int,
+    ) -> None:
+        """Test payloads that int() accepts set the poll interval."""
+        command_handler, callback = handler
+        command_handler._handle_poll_interval("command/poll_interval", payload)
+        callback.assert_called_once_with(expected)
+
+    @pytest.mark.parametrize("payload", ["", "abc", "30s", "1.5", "9", "3601", "-30"])
+    def test_rejects_invalid_or_out_of_range(
+        self,
+        handler: tuple[CommandHandler, MagicMock],
+        payload: str,
+    ) -> None:
+        """Test malformed and out-of-range payloads are ignored."""
+        command_handler, callback = handler
+        command_handler._handle_poll_interval("command/poll_interval", payload)
+        callback.assert_not_called()
@@ -112,6 +112,7 @@ class TestMqttConfig:
         assert config.keepalive == 60  # default
         assert config.qos == 1  # default
         assert config.base_topic == "libmbus2mqtt"  # default
+        assert config.max_inflight == 100  # default
 
     def test_client_id_auto_generated(self) -> None:
         """Test client_id is auto-generated if not provided."""
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+import json
+from collections import Counter
+from typing import Any
 
 import pytest
+from helpers import MqttSpy
 
 from libmbus2mqtt.config import HomeAssistantConfig
 from libmbus2mqtt.constants import APP_NAME, APP_VERSION, HA_DEFAULT_DISCOVERY_PREFIX
@@ -17,6 +20,16 @@ from libmbus2mqtt.mqtt.homeassistant import (
     get_mbus_device_info,
 )
 
+
+def _discovery_entries(client: MqttSpy) -> list[tuple[str, str, dict[str, Any]]]:
+    """Collect (component, object_id, config) entries from batched discovery publishes."""
+    return [
+        (component, object_id, json.loads(payload))
+        for args, _ in client.publish_ha_discovery_batch_calls
+        for component, object_id, payload in args[0]
+    ]
+
+
 # ============================================================================
 # Helper Function Tests
 # ============================================================================
@@ -110,25 +123,10 @@ class TestGetMbusDeviceInfo:
 class TestHomeAssistantDiscovery:
     """Tests for HomeAssistantDiscovery class."""
 
-    @pytest.fixture
-    def ha_config_enabled(self) -> HomeAssistantConfig:
-        """Home Assistant config with discovery enabled."""
-        return HomeAssistantConfig(enabled=True)
-
-    @pytest.fixture
-    def ha_config_disabled(self) -> HomeAssistantConfig:
-        """Home Assistant config with discovery disabled."""
-        return HomeAssistantConfig(enabled=False)
-
-    @pytest.fixture
-    def ha_config_custom_prefix(self) -> HomeAssistantConfig:
-        """Home Assistant config with custom discovery prefix."""
-        return HomeAssistantConfig(enabled=True, discovery_prefix="custom_prefix")
-
     @pytest.fixture
     def discovery(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
         ha_config_enabled: HomeAssistantConfig,
     ) -> HomeAssistantDiscovery:
         """Create HomeAssistantDiscovery instance."""
@@ -136,7 +134,7 @@ class TestHomeAssistantDiscovery:
 
     def test_discovery_prefix_default(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
         ha_config_enabled: HomeAssistantConfig,
     ) -> None:
         """Test default discovery prefix."""
@@ -145,7 +143,7 @@ class TestHomeAssistantDiscovery:
 
     def test_discovery_prefix_custom(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
         ha_config_custom_prefix: HomeAssistantConfig,
     ) -> None:
         """Test custom discovery prefix."""
@@ -154,7 +152,7 @@ class TestHomeAssistantDiscovery:
 
     def test_base_topic_from_mqtt_client(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
         ha_config_enabled: HomeAssistantConfig,
     ) -> None:
         """Test base topic comes from MQTT client."""
@@ -168,97 +166,200 @@ class TestPublishBridgeDiscovery:
     @pytest.fixture
     def discovery(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
+        ha_config_enabled: HomeAssistantConfig,
     ) -> HomeAssistantDiscovery:
         """Create HomeAssistantDiscovery instance."""
-        config = HomeAssistantConfig(enabled=True)
-        return HomeAssistantDiscovery(mock_mqtt_client, config)
+        return HomeAssistantDiscovery(mock_mqtt_client, ha_config_enabled)
 
     @pytest.fixture
     def discovery_disabled(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
+        ha_config_disabled: HomeAssistantConfig,
     ) -> HomeAssistantDiscovery:
         """Create HomeAssistantDiscovery instance with HA disabled."""
-        config = HomeAssistantConfig(enabled=False)
-        return HomeAssistantDiscovery(mock_mqtt_client, config)
+        return HomeAssistantDiscovery(mock_mqtt_client, ha_config_disabled)
 
     def test_publishes_bridge_sensors(
         self,
         discovery: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
     ) -> None:
         """Test bridge sensors are published."""
         discovery.publish_bridge_discovery()
 
-        # Check publish_ha_discovery was called for sensors
-        calls = mock_mqtt_client.publish_ha_discovery.call_args_list
-
-        # Should have multiple calls for different entities
-        assert len(calls) > 0
+        # All bridge entities should go out in a single batch
+        assert len(mock_mqtt_client.publish_ha_discovery_batch_calls) == 1
+        entries = _discovery_entries(mock_mqtt_client)
+        assert len(entries) > 0
 
         # Check for specific sensors
-        object_ids = [
-            c.kwargs.get("object_id", c.args[1] if len(c.args) > 1 else None) for c in calls
-        ]
-        expected_sensors = [
+        object_ids = {object_id for _, object_id, _ in entries}
+        expected_sensors = {
             f"{BRIDGE_DEVICE_ID}_discovered_devices",
             f"{BRIDGE_DEVICE_ID}_online_devices",
             f"{BRIDGE_DEVICE_ID}_version",
-        ]
-        for sensor in expected_sensors:
-            assert any(sensor in str(oid) for oid in object_ids)
+        }
+        assert expected_sensors <= object_ids
+
+    def test_publishes_bridge_controls(
+        self,
+        discovery: HomeAssistantDiscovery,
+        mock_mqtt_client: MqttSpy,
+    ) -> None:
+        """Test rescan button, log level select and poll interval number are published."""
+        discovery.publish_bridge_discovery()
+
+        by_component = Counter(
+            component for component, _, _ in _discovery_entries(mock_mqtt_client)
+        )
+        assert by_component["button"] >= 1
+        assert by_component["select"] >= 1
+        assert by_component["number"] >= 1
+
+    def test_disabled_does_not_publish(
+        self,
+        discovery_disabled: HomeAssistantDiscovery,
+        mock_mqtt_client: MqttSpy,
+    ) -> None:
+        """Test disabled config does not publish."""
+        discovery_disabled.publish_bridge_discovery()
+        assert not mock_mqtt_client.publish_ha_discovery_batch_calls
 
-    def test_publishes_bridge_button(
+    def test_bridge_availability_shared(
         self,
         discovery: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
     ) -> None:
-        """Test rescan button is published."""
+        """Test bridge entities share the bridge availability entry."""
         discovery.publish_bridge_discovery()
 
-        calls = mock_mqtt_client.publish_ha_discovery.call_args_list
+        entries = [config["availability"] for _, _, config in _discovery_entries(mock_mqtt_client)]
+        assert all(entry == list(discovery._bridge_availability) for entry in entries)
+        assert entries[0][0]["topic"].endswith("/bridge/state")
 
-        # Find button call
-        button_calls = [c for c in calls if c.kwargs.get("component") == "button"]
-        assert len(button_calls) > 0
+    def test_device_availability_cached_per_topic(
+        self,
+        discovery: HomeAssistantDiscovery,
+    ) -> None:
+        """Test device availability lists are built once per topic."""
+        first = discovery._build_device_availability_list("test/dev1/availability")
+        again = discovery._build_device_availability_list("test/dev1/availability")
+        other = discovery._build_device_availability_list("test/dev2/availability")
 
-    def test_publishes_bridge_select(
+        assert first is again
+        assert other is not first
+        assert other[1]["topic"] == "test/dev2/availability"
+
+    def test_unchanged_configs_not_republished(
         self,
         discovery: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
     ) -> None:
-        """Test log level select is published."""
+        """Test republishing identical configs sends nothing."""
         discovery.publish_bridge_discovery()
+        mock_mqtt_client.reset_mock()
 
-        calls = mock_mqtt_client.publish_ha_discovery.call_args_list
+        discovery.publish_bridge_discovery()
 
-        # Find select call
-        select_calls = [c for c in calls if c.kwargs.get("component") == "select"]
-        assert len(select_calls) > 0
+        assert not mock_mqtt_client.publish_ha_discovery_batch_calls
 
-    def test_publishes_bridge_number(
+    def test_mark_stale_forces_republish(
         self,
         discovery: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
     ) -> None:
-        """Test poll interval number is published."""
+        """Test mark_stale makes every config publish again."""
         discovery.publish_bridge_discovery()
+        num_published = len(_discovery_entries(mock_mqtt_client))
+        mock_mqtt_client.reset_mock()
 
-        calls = mock_mqtt_client.publish_ha_discovery.call_args_list
+        discovery.mark_stale()
+        discovery.publish_bridge_discovery()
 
-        # Find number call
-        number_calls = [c for c in calls if c.kwargs.get("component") == "number"]
-        assert len(number_calls) > 0
+        assert len(_discovery_entries(mock_mqtt_client)) == num_published
 
-    def test_disabled_does_not_publish(
+    def test_failed_flush_retried(
         self,
-        discovery_disabled: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
+        discovery: HomeAssistantDiscovery,
+        mock_mqtt_client: MqttSpy,
     ) -> None:
-        """Test disabled config does not publish."""
-        discovery_disabled.publish_bridge_discovery()
-        mock_mqtt_client.publish_ha_discovery.assert_not_called()
+        """Test configs are resent after a failed batch publish."""
+        mock_mqtt_client.batch_result = False
+        discovery.publish_bridge_discovery()
+        num_published = len(_discovery_entries(mock_mqtt_client))
+        mock_mqtt_client.reset_mock()
+
+        mock_mqtt_client.batch_result = True
+        discovery.publish_bridge_discovery()
+
+        assert len(_discovery_entries(mock_mqtt_client)) == num_published
+
+    def test_queue_during_flush_kept_for_next_flush(
+        self,
+        discovery: HomeAssistantDiscovery,
+        mock_mqtt_client: MqttSpy,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test a config queued while a batch is in flight is neither lost nor mismatched."""
+        publish_batch = mock_mqtt_client.publish_ha_discovery_batch
+
+        def publish_and_queue(*args: Any, **kwargs: Any) -> bool:
+            # Another thread queues a config while this batch is being sent
+            discovery._queue_discovery("sensor", "late", {"name": "Late"})
+            return publish_batch(*args, **kwargs)
+
+        monkeypatch.setattr(mock_mqtt_client, "publish_ha_discovery_batch", publish_and_queue)
+        discovery._queue_discovery("sensor", "early", {"name": "Early"})
+        assert discovery.flush()
+        monkeypatch.undo()
+
+        assert [entry[1] for entry in _discovery_entries(mock_mqtt_client)] == ["early"]
+        mock_mqtt_client.reset_mock()
+
+        assert discovery.flush()
+        assert [entry[1] for entry in _discovery_entries(mock_mqtt_client)] == ["late"]
+
+        # Both hashes were recorded against the right entity, so nothing is resent
+        mock_mqtt_client.reset_mock()
+        discovery._queue_discovery("sensor", "early", {"name": "Early"})
+        discovery._queue_discovery("sensor", "late", {"name": "Late"})
+        discovery.flush()
+        assert not mock_mqtt_client.publish_ha_discovery_batch_calls
+
+    def test_mark_stale_during_flush(
+        self,
+        discovery: HomeAssistantDiscovery,
+        mock_mqtt_client: MqttSpy,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test mark_stale can run while a flush is publishing."""
+        discovery.publish_bridge_discovery()
+        bridge_entities = {entry[:2] for entry in _discovery_entries(mock_mqtt_client)}
+        mock_mqtt_client.reset_mock()
+        publish_batch = mock_mqtt_client.publish_ha_discovery_batch
+
+        def publish_and_mark_stale(*args: Any, **kwargs: Any) -> bool:
+            # Reconnect handler on paho's thread
+            discovery.mark_stale()
+            return publish_batch(*args, **kwargs)
+
+        monkeypatch.setattr(mock_mqtt_client, "publish_ha_discovery_batch", publish_and_mark_stale)
+        discovery._queue_discovery("sensor", "new", {"name": "New"})
+        assert discovery.flush()
+        monkeypatch.undo()
+        mock_mqtt_client.reset_mock()
+
+        # Every bridge config was marked stale, so all of them are sent again
+        discovery.publish_bridge_discovery()
+        assert {entry[:2] for entry in _discovery_entries(mock_mqtt_client)} == bridge_entities
+        mock_mqtt_client.reset_mock()
+
+        # The config published by the in-flight flush was recorded and is skipped as unchanged
+        discovery._queue_discovery("sensor", "new", {"name": "New"})
+        assert discovery.flush()
+        assert not mock_mqtt_client.publish_ha_discovery_batch_calls
 
 
 class TestPublishDeviceDiscovery:
@@ -267,96 +368,71 @@ class TestPublishDeviceDiscovery:
     @pytest.fixture
     def discovery(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
+        ha_config_enabled: HomeAssistantConfig,
     ) -> HomeAssistantDiscovery:
         """Create HomeAssistantDiscovery instance."""
-        config = HomeAssistantConfig(enabled=True)
-        return HomeAssistantDiscovery(mock_mqtt_client, config)
+        return HomeAssistantDiscovery(mock_mqtt_client, ha_config_enabled)
 
     @pytest.fixture
     def discovery_disabled(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
+        ha_config_disabled: HomeAssistantConfig,
     ) -> HomeAssistantDiscovery:
         """Create HomeAssistantDiscovery instance with HA disabled."""
-        config = HomeAssistantConfig(enabled=False)
-        return HomeAssistantDiscovery(mock_mqtt_client, config)
+        return HomeAssistantDiscovery(mock_mqtt_client, ha_config_disabled)
 
     def test_publishes_device_with_template(
         self,
         discovery: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
-        itron_mbus_data: MbusData,
+        mock_mqtt_client: MqttSpy,
+        itron_device: Device,
     ) -> None:
         """Test device with template publishes template entities."""
-        device = Device(address=1)
-        device.update_from_mbus_data(itron_mbus_data)
-
-        discovery.publish_device_discovery(device)
+        discovery.publish_device_discovery(itron_device)
 
-        # Should have called publish_ha_discovery
-        assert mock_mqtt_client.publish_ha_discovery.called
+        # Should have published a discovery batch
+        assert mock_mqtt_client.publish_ha_discovery_batch_calls
 
         # Device should be marked as published
-        assert device.ha_discovery_published is True
+        assert itron_device.ha_discovery_published is True
 
     def test_publishes_device_generic_entities(
         self,
         discovery: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
+        generic_device: Device,
     ) -> None:
         """Test device without template publishes generic entities."""
-        device = Device(address=1)
-        device.manufacturer = "UNKNOWN"  # No template for this
-
-        # Create minimal mbus_data manually
-        from libmbus2mqtt.models.mbus import DataRecord, MbusData, SlaveInformation
-
-        mbus_data = MbusData(
-            slave_information=SlaveInformation(
-                Id="123",
-                Manufacturer="UNKNOWN",
-                Version="1",
-                Medium="Water",
-            ),
-            data_records={
-                "0": DataRecord(
-                    id="0",
-                    Function="Volume",
-                    Unit="m^3",
-                    Value="12345",
-                )
-            },
-        )
-        device.mbus_data = mbus_data
+        discovery.publish_device_discovery(generic_device)
 
-        discovery.publish_device_discovery(device)
+        # Should have published a discovery batch
+        assert mock_mqtt_client.publish_ha_discovery_batch_calls
+        assert generic_device.ha_discovery_published is True
 
-        # Should have called publish_ha_discovery
-        assert mock_mqtt_client.publish_ha_discovery.called
-        assert device.ha_discovery_published is True
+        _, object_id, cfg = _discovery_entries(mock_mqtt_client)[0]
+        assert object_id == f"{APP_NAME}_{generic_device.object_id}_record_0"
+        assert cfg["value_template"] == "{{ value_json.records['0'].value }}"
 
     def test_disabled_does_not_publish(
         self,
         discovery_disabled: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
-        itron_mbus_data: MbusData,
+        mock_mqtt_client: MqttSpy,
+        itron_device: Device,
     ) -> None:
         """Test disabled config does not publish."""
-        device = Device(address=1)
-        device.update_from_mbus_data(itron_mbus_data)
-
-        discovery_disabled.publish_device_discovery(device)
+        discovery_disabled.publish_device_discovery(itron_device)
 
-        mock_mqtt_client.publish_ha_discovery.assert_not_called()
-        assert device.ha_discovery_published is False
+        assert not mock_mqtt_client.publish_ha_discovery_batch_calls
+        assert itron_device.ha_discovery_published is False
 
     def test_template_fields_passthrough(
         self,
-        mock_mqtt_client: MagicMock,
+        discovery: HomeAssistantDiscovery,
+        mock_mqtt_client: MqttSpy,
     ) -> None:
         """Template-defined discovery fields should be passed through."""
-        discovery = HomeAssistantDiscovery(mock_mqtt_client, HomeAssistantConfig(enabled=True))
         device = Device(address=1)
         device_info = get_mbus_device_info(device)
         template = {
@@ -378,9 +454,9 @@ class TestPublishDeviceDiscovery:
             state_topic="test/state",
             availability=[],
         )
+        discovery.flush()
 
-        args = mock_mqtt_client.publish_ha_discovery.call_args
-        cfg = args.kwargs["config"]
+        _, _, cfg = _discovery_entries(mock_mqtt_client)[0]
         assert cfg["entity_category"] == "diagnostic"
         assert cfg["enabled_by_default"] is False
         assert cfg["suggested_display_precision"] == 2
@@ -393,33 +469,32 @@ class TestRemoveAllDiscovery:
     @pytest.fixture
     def discovery(
         self,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
+        ha_config_enabled: HomeAssistantConfig,
     ) -> HomeAssistantDiscovery:
         """Create HomeAssistantDiscovery instance."""
-        config = HomeAssistantConfig(enabled=True)
-        return HomeAssistantDiscovery(mock_mqtt_client, config)
+        return HomeAssistantDiscovery(mock_mqtt_client, ha_config_enabled)
 
     def test_removes_published_entities(
         self,
         discovery: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
     ) -> None:
         """Test removes all published entities."""
         # First publish some entities
         discovery.publish_bridge_discovery()
 
         # Get number of published entities
-        num_published = len(discovery._published_entities)
+        num_published = sum(len(ids) for ids in discovery._published_entities.values())
         assert num_published > 0
 
-        # Clear mock to count removal calls
-        mock_mqtt_client.reset_mock()
-
         # Remove all
         discovery.remove_all_discovery()
 
-        # Should have called remove_ha_discovery for each entity
-        assert mock_mqtt_client.remove_ha_discovery.call_count == num_published
+        # Should remove every entity in a single batch
+        assert len(mock_mqtt_client.remove_ha_discovery_batch_calls) == 1
+        args, _ = mock_mqtt_client.remove_ha_discovery_batch_calls[0]
+        assert len(args[0]) == num_published
 
         # Published entities should be cleared
         assert len(discovery._published_entities) == 0
@@ -427,8 +502,8 @@ class TestRemoveAllDiscovery:
     def test_empty_entities_does_nothing(
         self,
         discovery: HomeAssistantDiscovery,
-        mock_mqtt_client: MagicMock,
+        mock_mqtt_client: MqttSpy,
     ) -> None:
         """Test removing with no entities does nothing."""
         discovery.remove_all_discovery()
-        mock_mqtt_client.remove_ha_discovery.assert_not_called()
+        assert not mock_mqtt_client.remove_ha_discovery_batch_calls
@@ -0,0 +1,112 @@
+"""Tests for the daemon polling loop."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from helpers import PahoClientStub
+
+from libmbus2mqtt.config import AppConfig
+from libmbus2mqtt.main import Daemon
+from libmbus2mqtt.models.device import AvailabilityStatus, Device
+from libmbus2mqtt.models.mbus import MbusData
+from libmbus2mqtt.mqtt import MqttClient
+
+
+class TestPollDevices:
+    """Tests for Daemon._poll_devices."""
+
+    @pytest.fixture
+    def daemon(self, minimal_app_config: AppConfig) -> Daemon:
+        """Daemon with a mock M-Bus interface and a mock-connected MQTT client."""
+        daemon = Daemon(minimal_app_config)
+        daemon._mbus = MagicMock()
+        mqtt_client = MqttClient(minimal_app_config.mqtt)
+        mqtt_client._client = PahoClientStub()  # type: ignore[assignment]
+        mqtt_client._connected.set()
+        daemon._mqtt = mqtt_client
+        return daemon
+
+    @staticmethod
+    def _published(daemon: Daemon) -> list[tuple[str, Any]]:
+        """Return (topic, payload) for every message handed to paho."""
+        assert daemon._mqtt is not None
+        stub: PahoClientStub = daemon._mqtt._client  # type: ignore[assignment]
+        return [(args[0], args[1]) for args, _ in stub.publish_calls]
+
+    def test_publishes_state_and_availability_per_device(
+        self,
+        daemon: Daemon,
+        itron_mbus_data: MbusData,
+    ) -> None:
+        """Test each device's messages are published right after that device is polled."""
+        online = Device(address=1)
+        offline = Device(address=2)
+        offline.availability.timeout_threshold = 1
+        daemon._devices = {1: online, 2: offline}
+
+        published_before_poll: list[int] = []
+
+        def poll(address: int, timeout: int) -> MbusData | None:
+            published_before_poll.append(len(self._published(daemon)))
+            return itron_mbus_data if address == 1 else None
+
+        assert daemon._mbus is not None
+        daemon._mbus.poll.side_effect = poll
+
+        daemon._poll_devices()
+
+        base = daemon.config.mqtt.base_topic
+        published = self._published(daemon)
+        assert [topic for topic, _ in published] == [
+            f"{base}/device/{online.object_id}/state",
+            f"{base}/device/{online.object_id}/availability",
+            f"{base}/device/2/availability",
+        ]
+        assert json.loads(published[0][1]) == itron_mbus_data.to_generic_state()
+        assert published[1][1] == "online"
+        assert published[2][1] == "offline"
+        # The first device's messages were out before the second device was polled
+        assert published_before_poll == [0, 2]
+
+        assert online.availability.status is AvailabilityStatus.ONLINE
+        assert offline.availability.status is AvailabilityStatus.OFFLINE
+        assert not online.availability.status_changed
+        assert not offline.availability.status_changed
+
+    def test_unchanged_availability_not_republished(
+        self,
+        daemon: Daemon,
+        itron_mbus_data: MbusData,
+    ) -> None:
+        """Test only the state is published once a device is already online."""
+        device = Device(address=1)
+        daemon._devices = {1: device}
+        assert daemon._mbus is not None
+        daemon._mbus.poll.return_value = itron_mbus_data
+
+        daemon._poll_devices()
+        assert daemon._mqtt is not None
+        daemon._mqtt._client.publish_calls.clear()  # type: ignore[union-attr]
+        daemon._poll_devices()
+
+        base = daemon.config.mqtt.base_topic
+        assert [topic for topic, _ in self._published(daemon)] == [
+            f"{base}/device/{device.object_id}/state"
+        ]
+
+    def test_failure_below_threshold_publishes_nothing(self, daemon: Daemon) -> None:
+        """Test a failed poll below the offline threshold sends no messages."""
+        device = Device(address=1)
+        daemon._devices = {1: device}
+        assert daemon._mbus is not None
+        daemon._mbus.poll.return_value = None
+
+        daemon._poll_devices()
+
+        assert self._published(daemon) == []
+        assert device.availability.status is AvailabilityStatus.UNKNOWN
+        assert device.availability.poll_consecutive_fails == 1
@@ -13,12 +13,16 @@ from libmbus2mqtt.mbus.interface import SCAN_PATTERN, MbusInterface
 # Shared fixtures
 
 
-@pytest.fixture
-def mock_libmbus_path(tmp_path: Path) -> Path:
-    """Create mock libmbus binaries."""
-    for binary in ["mbus-serial-scan", "mbus-serial-request-data"]:
-        (tmp_path / binary).touch()
-    return tmp_path
+@pytest.fixture(scope="module")
+def interface(mock_libmbus_path: Path) -> MbusInterface:
+    """Create MbusInterface instance (not mutated by the tests using it)."""
+    return MbusInterface(
+        device="/dev/ttyUSB0",
+        baudrate=2400,
+        libmbus_path=mock_libmbus_path,
+        retry_count=0,
+        retry_delay=0,
+    )
 
 
 # ============================================================================
@@ -57,6 +61,16 @@ class TestScanPattern:
         assert isinstance(match.group(1), str)
         assert int(match.group(1)) == 42
 
+    def test_findall_extracts_all_in_one_call(self) -> None:
+        """Test findall extracts every address from multi-line scan output."""
+        output = (
+            "Found a M-Bus device at address 1\n"
+            "Some other output\n"
+            "Found a M-Bus device at address 5\n"
+            "Found a M-Bus device at address 10\n"
+        )
+        assert SCAN_PATTERN.findall(output) == ["1", "5", "10"]
+
 
 # ============================================================================
 # MbusInterface Initialization Tests
@@ -78,18 +92,14 @@ class TestMbusInterfaceInit:
         assert interface.libmbus_path == mock_libmbus_path
 
     def test_init_validates_binaries_in_path(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, mock_subprocess: MagicMock
     ) -> None:
         """Test initialization checks PATH if binaries not in libmbus_path."""
         # Empty directory (no binaries)
         empty_dir = tmp_path / "empty"
         empty_dir.mkdir()
 
-        # Mock subprocess.run for 'which' command to succeed
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
+        # mock_subprocess makes the 'which' lookup succeed
         interface = MbusInterface(
             device="/dev/ttyUSB0",
             libmbus_path=empty_dir,
@@ -97,17 +107,14 @@ class TestMbusInterfaceInit:
         assert interface.device == "/dev/ttyUSB0"
 
     def test_init_raises_if_binaries_missing(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, mock_subprocess: MagicMock
     ) -> None:
         """Test initialization raises if binaries not found."""
         empty_dir = tmp_path / "empty"
         empty_dir.mkdir()
 
         # Mock subprocess.run for 'which' command to fail
-        def mock_run(*args: object, **kwargs: object) -> None:
-            raise subprocess.CalledProcessError(1, "which")
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        mock_subprocess.side_effect = subprocess.CalledProcessError(1, "which")
 
         with pytest.raises(FileNotFoundError, match="libmbus binary not found"):
             MbusInterface(device="/dev/ttyUSB0", libmbus_path=empty_dir)
@@ -129,28 +136,10 @@ class TestMbusInterfaceInit:
 class TestMbusInterfaceScan:
     """Tests for MbusInterface scan method."""
 
-    @pytest.fixture
-    def mock_libmbus_path(self, tmp_path: Path) -> Path:
-        """Create mock libmbus binaries."""
-        for binary in ["mbus-serial-scan", "mbus-serial-request-data"]:
-            (tmp_path / binary).touch()
-        return tmp_path
-
-    @pytest.fixture
-    def interface(self, mock_libmbus_path: Path) -> MbusInterface:
-        """Create MbusInterface instance."""
-        return MbusInterface(
-            device="/dev/ttyUSB0",
-            baudrate=2400,
-            libmbus_path=mock_libmbus_path,
-            retry_count=0,
-            retry_delay=0,
-        )
-
     def test_scan_returns_discovered_devices(
         self,
         interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
     ) -> None:
         """Test scan returns list of discovered device IDs."""
         scan_output = """
@@ -158,9 +147,7 @@ Found a M-Bus device at address 1
 Found a M-Bus device at address 5
 Found a M-Bus device at address 10
 """
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout=scan_output, stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        mock_subprocess.return_value.stdout = scan_output
 
         devices = interface.scan()
         assert devices == [1, 5, 10]
@@ -168,71 +155,29 @@ Found a M-Bus device at address 10
     def test_scan_returns_empty_on_no_devices(
         self,
         interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
     ) -> None:
         """Test scan returns empty list when no devices found."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
         devices = interface.scan()
         assert devices == []
 
-    def test_scan_returns_empty_on_timeout(
+    @pytest.mark.parametrize(
+        "side_effect",
+        [subprocess.TimeoutExpired("cmd", 60), OSError("Device error")],
+        ids=["timeout", "error"],
+    )
+    def test_scan_returns_empty_on_failure(
         self,
         interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
+        side_effect: Exception,
     ) -> None:
-        """Test scan returns empty list on timeout."""
-
-        def mock_run(*args: object, **kwargs: object) -> None:
-            raise subprocess.TimeoutExpired("cmd", 60)
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        """Test scan returns empty list on timeout or general error."""
+        mock_subprocess.side_effect = side_effect
 
         devices = interface.scan(timeout=60)
         assert devices == []
 
-    def test_scan_returns_empty_on_error(
-        self,
-        interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test scan returns empty list on general error."""
-
-        def mock_run(*args: object, **kwargs: object) -> None:
-            raise OSError("Device error")
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
-        devices = interface.scan()
-        assert devices == []
-
-    def test_scan_uses_correct_command(
-        self,
-        interface: MbusInterface,
-        mock_libmbus_path: Path,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test scan uses correct command arguments."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
-        interface.scan(timeout=30)
-
-        call_args = mock_run.call_args
-        cmd = call_args[0][0]
-
-        # Should include binary, -b baudrate, device
-        assert "mbus-serial-scan" in cmd[0]
-        assert "-b" in cmd
-        assert "2400" in cmd
-        assert "/dev/ttyUSB0" in cmd
-
-        # Should include timeout
-        assert call_args[1]["timeout"] == 30
-
 
 # ============================================================================
 # MbusInterface Poll Raw Tests
@@ -242,120 +187,92 @@ Found a M-Bus device at address 10
 class TestMbusInterfacePollRaw:
     """Tests for MbusInterface poll_raw method."""
 
-    @pytest.fixture
-    def mock_libmbus_path(self, tmp_path: Path) -> Path:
-        """Create mock libmbus binaries."""
-        for binary in ["mbus-serial-scan", "mbus-serial-request-data"]:
-            (tmp_path / binary).touch()
-        return tmp_path
-
-    @pytest.fixture
-    def interface(self, mock_libmbus_path: Path) -> MbusInterface:
-        """Create MbusInterface instance."""
-        return MbusInterface(
-            device="/dev/ttyUSB0",
-            baudrate=2400,
-            libmbus_path=mock_libmbus_path,
-            retry_count=0,
-            retry_delay=0,
-        )
-
     def test_poll_raw_returns_xml(
         self,
         interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
         apator_xml: str,
     ) -> None:
         """Test poll_raw returns XML string."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout=apator_xml, stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        mock_subprocess.return_value.stdout = apator_xml
 
         result = interface.poll_raw(1)
         assert result == apator_xml
 
-    def test_poll_raw_returns_none_on_error(
-        self,
-        interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test poll_raw returns None on error."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="", stderr="Error", returncode=1)
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
-        result = interface.poll_raw(1)
-        assert result is None
-
-    def test_poll_raw_returns_none_on_timeout(
+    @pytest.mark.parametrize(
+        ("side_effect", "returncode"),
+        [
+            (None, 1),
+            (subprocess.TimeoutExpired("cmd", 10), 0),
+            (OSError("Device error"), 0),
+        ],
+        ids=["error", "timeout", "exception"],
+    )
+    def test_poll_raw_returns_none_on_failure(
         self,
         interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
+        side_effect: Exception | None,
+        returncode: int,
     ) -> None:
-        """Test poll_raw returns None on timeout."""
-
-        def mock_run(*args: object, **kwargs: object) -> None:
-            raise subprocess.TimeoutExpired("cmd", 10)
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        """Test poll_raw returns None on error exit, timeout or exception."""
+        mock_subprocess.side_effect = side_effect
+        mock_subprocess.return_value.stderr = "Error"
+        mock_subprocess.return_value.returncode = returncode
 
         result = interface.poll_raw(1, timeout=10)
         assert result is None
 
-    def test_poll_raw_returns_none_on_exception(
+    def test_poll_raw_warns_on_device_id_0(
         self,
         interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
+        caplog: pytest.LogCaptureFixture,
     ) -> None:
-        """Test poll_raw returns None on general exception."""
+        """Test poll_raw logs warning for device ID 0."""
+        interface.poll_raw(0)
+        assert "device ID 0" in caplog.text
 
-        def mock_run(*args: object, **kwargs: object) -> None:
-            raise OSError("Device error")
 
-        monkeypatch.setattr(subprocess, "run", mock_run)
+# ============================================================================
+# MbusInterface Command Tests
+# ============================================================================
 
-        result = interface.poll_raw(1)
-        assert result is None
 
-    def test_poll_raw_uses_correct_command(
+class TestMbusInterfaceCommand:
+    """Tests for the libmbus command lines built by MbusInterface."""
+
+    @pytest.mark.parametrize(
+        ("method", "args", "binary", "extra", "timeout"),
+        [
+            ("scan", (), "mbus-serial-scan", [], 30),
+            ("poll_raw", (42,), "mbus-serial-request-data", ["42"], 15),
+        ],
+    )
+    def test_uses_correct_command(
         self,
         interface: MbusInterface,
-        mock_libmbus_path: Path,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
+        method: str,
+        args: tuple[int, ...],
+        binary: str,
+        extra: list[str],
+        timeout: int,
     ) -> None:
-        """Test poll_raw uses correct command arguments."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        """Test commands include binary, -b baudrate, device and timeout."""
+        getattr(interface, method)(*args, timeout=timeout)
 
-        interface.poll_raw(42, timeout=15)
-
-        call_args = mock_run.call_args
+        call_args = mock_subprocess.call_args
         cmd = call_args[0][0]
 
-        # Should include binary, -b baudrate, device, device_id
-        assert "mbus-serial-request-data" in cmd[0]
+        assert binary in cmd[0]
         assert "-b" in cmd
         assert "2400" in cmd
         assert "/dev/ttyUSB0" in cmd
-        assert "42" in cmd
-
-        # Should include timeout
-        assert call_args[1]["timeout"] == 15
-
-    def test_poll_raw_warns_on_device_id_0(
-        self,
-        interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
-        caplog: pytest.LogCaptureFixture,
-    ) -> None:
-        """Test poll_raw logs warning for device ID 0."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        for arg in extra:
+            assert arg in cmd
 
-        interface.poll_raw(0)
-        assert "device ID 0" in caplog.text
+        assert call_args[1]["timeout"] == timeout
 
 
 # ============================================================================
@@ -366,34 +283,14 @@ class TestMbusInterfacePollRaw:
 class TestMbusInterfacePoll:
     """Tests for MbusInterface poll method."""
 
-    @pytest.fixture
-    def mock_libmbus_path(self, tmp_path: Path) -> Path:
-        """Create mock libmbus binaries."""
-        for binary in ["mbus-serial-scan", "mbus-serial-request-data"]:
-            (tmp_path / binary).touch()
-        return tmp_path
-
-    @pytest.fixture
-    def interface(self, mock_libmbus_path: Path) -> MbusInterface:
-        """Create MbusInterface instance."""
-        return MbusInterface(
-            device="/dev/ttyUSB0",
-            baudrate=2400,
-            libmbus_path=mock_libmbus_path,
-            retry_count=0,
-            retry_delay=0,
-        )
-
     def test_poll_returns_parsed_data(
         self,
         interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
         apator_xml: str,
     ) -> None:
         """Test poll returns parsed MbusData."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout=apator_xml, stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        mock_subprocess.return_value.stdout = apator_xml
 
         result = interface.poll(1)
 
@@ -401,28 +298,21 @@ class TestMbusInterfacePoll:
         assert result.device_id == "67434"
         assert result.manufacturer == "APA"
 
-    def test_poll_returns_none_on_raw_failure(
+    @pytest.mark.parametrize(
+        ("stdout", "returncode"),
+        [("", 1), ("invalid xml", 0)],
+        ids=["raw_failure", "parse_error"],
+    )
+    def test_poll_returns_none_on_failure(
         self,
         interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
+        stdout: str,
+        returncode: int,
     ) -> None:
-        """Test poll returns None when poll_raw fails."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="", stderr="Error", returncode=1)
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
-        result = interface.poll(1)
-        assert result is None
-
-    def test_poll_returns_none_on_parse_error(
-        self,
-        interface: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test poll returns None when parsing fails."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="invalid xml", stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        """Test poll returns None when poll_raw fails or parsing fails."""
+        mock_subprocess.return_value.stdout = stdout
+        mock_subprocess.return_value.returncode = returncode
 
         result = interface.poll(1)
         assert result is None
@@ -436,13 +326,6 @@ class TestMbusInterfacePoll:
 class TestMbusInterfaceBinaryPath:
     """Tests for _get_binary_path method."""
 
-    @pytest.fixture
-    def mock_libmbus_path(self, tmp_path: Path) -> Path:
-        """Create mock libmbus binaries."""
-        for binary in ["mbus-serial-scan", "mbus-serial-request-data"]:
-            (tmp_path / binary).touch()
-        return tmp_path
-
     def test_returns_full_path_when_exists(self, mock_libmbus_path: Path) -> None:
         """Test returns full path when binary exists in libmbus_path."""
         interface = MbusInterface(
@@ -454,18 +337,14 @@ class TestMbusInterfaceBinaryPath:
         assert path == str(mock_libmbus_path / "mbus-serial-scan")
 
     def test_returns_name_only_when_not_exists(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, mock_subprocess: MagicMock
     ) -> None:
         """Test returns binary name only when not in libmbus_path."""
         # Create directory without binaries
         empty_dir = tmp_path / "empty"
         empty_dir.mkdir()
 
-        # Mock 'which' to succeed (so validation passes)
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
+        # mock_subprocess makes the 'which' lookup succeed (so validation passes)
         interface = MbusInterface(
             device="/dev/ttyUSB0",
             libmbus_path=empty_dir,
@@ -485,50 +364,37 @@ class TestMbusInterfaceTcp:
     """Tests for TCP mode command construction and validation."""
 
     @pytest.fixture
-    def mock_tcp_libmbus_path(self, tmp_path: Path) -> Path:
-        """Create mock libmbus TCP binaries."""
-        for binary in ["mbus-tcp-scan", "mbus-tcp-request-data"]:
-            (tmp_path / binary).touch()
-        return tmp_path
-
-    @pytest.fixture
-    def tcp_interface(self, mock_tcp_libmbus_path: Path) -> MbusInterface:
+    def tcp_interface(self, mock_libmbus_path: Path) -> MbusInterface:
         """Create interface in TCP mode."""
         return MbusInterface(
             device="192.168.1.10:10001",
             baudrate=2400,  # ignored for TCP
-            libmbus_path=mock_tcp_libmbus_path,
+            libmbus_path=mock_libmbus_path,
             retry_count=0,
             retry_delay=0,
         )
 
     def test_scan_uses_tcp_binary_and_host_port(
-        self, tcp_interface: MbusInterface, monkeypatch: pytest.MonkeyPatch
+        self, tcp_interface: MbusInterface, mock_subprocess: MagicMock
     ) -> None:
         """TCP scan should call mbus-tcp-scan host port."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
         tcp_interface.scan(timeout=5)
 
-        call_args = mock_run.call_args
+        call_args = mock_subprocess.call_args
         cmd = call_args[0][0]
         assert "mbus-tcp-scan" in cmd[0]
         assert "192.168.1.10" in cmd
         assert "10001" in cmd
 
     def test_poll_raw_uses_tcp_binary_and_host_port(
-        self, tcp_interface: MbusInterface, monkeypatch: pytest.MonkeyPatch
+        self, tcp_interface: MbusInterface, mock_subprocess: MagicMock
     ) -> None:
         """TCP poll_raw should call mbus-tcp-request-data host port id."""
-        mock_run = MagicMock()
-        mock_run.return_value = MagicMock(stdout="<xml/>", stderr="", returncode=0)
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        mock_subprocess.return_value.stdout = "<xml/>"
 
         tcp_interface.poll_raw(3, timeout=4)
 
-        call_args = mock_run.call_args
+        call_args = mock_subprocess.call_args
         cmd = call_args[0][0]
         assert "mbus-tcp-request-data" in cmd[0]
         assert "192.168.1.10" in cmd
@@ -558,36 +424,24 @@ class TestMbusInterfaceRetries:
     def test_poll_raw_retries_and_succeeds(
         self,
         interface_with_retries: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
     ) -> None:
         """Poll should retry after a timeout and then succeed."""
-        responses = [
+        mock_subprocess.side_effect = [
             subprocess.TimeoutExpired(cmd="cmd", timeout=10),
-            MagicMock(stdout="xml-data", stderr="", returncode=0),
+            subprocess.CompletedProcess([], 0, stdout="xml-data", stderr=""),
         ]
 
-        def mock_run(*args: object, **kwargs: object) -> MagicMock:
-            response = responses.pop(0)
-            if isinstance(response, Exception):
-                raise response
-            return response
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
         result = interface_with_retries.poll_raw(1, timeout=10)
         assert result == "xml-data"
 
     def test_poll_raw_exhausts_retries(
         self,
         interface_with_retries: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
     ) -> None:
         """Poll should return None after exhausting retries."""
-        monkeypatch.setattr(
-            subprocess,
-            "run",
-            MagicMock(side_effect=subprocess.CalledProcessError(1, "cmd")),
-        )
+        mock_subprocess.side_effect = subprocess.CalledProcessError(1, "cmd")
 
         result = interface_with_retries.poll_raw(1, timeout=5)
         assert result is None
@@ -595,22 +449,18 @@ class TestMbusInterfaceRetries:
     def test_scan_retries_and_succeeds(
         self,
         interface_with_retries: MbusInterface,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_subprocess: MagicMock,
     ) -> None:
         """Scan should retry on failure and succeed on a later attempt."""
-        attempts = [
-            MagicMock(stdout="", stderr="fail", returncode=1),
-            MagicMock(
+        mock_subprocess.side_effect = [
+            subprocess.CompletedProcess([], 1, stdout="", stderr="fail"),
+            subprocess.CompletedProcess(
+                [],
+                0,
                 stdout="Found a M-Bus device at address 3\nFound a M-Bus device at address 7",
                 stderr="",
-                returncode=0,
             ),
         ]
 
-        def mock_run(*args: object, **kwargs: object) -> MagicMock:
-            return attempts.pop(0)
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
-
         devices = interface_with_retries.scan(timeout=5)
         assert devices == [3, 7]
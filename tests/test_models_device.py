@@ -131,6 +131,19 @@ class TestDeviceAvailability:
         assert avail.last_poll_time is not None
         assert before <= avail.last_poll_time <= after
 
+    def test_last_poll_time_uses_given_timestamp(self) -> None:
+        """Test poll_success/poll_fail record a caller-supplied timestamp."""
+        from datetime import datetime
+
+        avail = DeviceAvailability()
+        cycle_time = datetime(2024, 1, 1, 12, 0, 0)
+
+        avail.poll_success(cycle_time)
+        assert avail.last_poll_time == cycle_time
+
+        avail.poll_fail(cycle_time)
+        assert avail.last_poll_time == cycle_time
+
     def test_poll_fail_from_online(self) -> None:
         """Test poll_fail from ONLINE state."""
         avail = DeviceAvailability(
@@ -285,3 +298,18 @@ class TestDevice:
         """Test enabled can be set to False."""
         device = Device(address=1, enabled=False)
         assert device.enabled is False
+
+    def test_runtime_state_not_serialized(self, apator_mbus_data: MbusData) -> None:
+        """Test runtime state is excluded from model dumps."""
+        device = Device(address=1)
+        device.update_from_mbus_data(apator_mbus_data)
+        device.ha_discovery_published = True
+
+        assert device.runtime.mbus_data is apator_mbus_data
+        assert device.runtime.ha_discovery_published is True
+        assert "runtime" not in device.model_dump()
+
+    def test_runtime_is_slotted(self) -> None:
+        """Test runtime state has no per-instance __dict__."""
+        device = Device(address=1)
+        assert not hasattr(device.runtime, "__dict__")
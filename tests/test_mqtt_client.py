@@ -6,10 +6,10 @@ import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+from helpers import PahoClientStub
 
 from libmbus2mqtt.config import MqttConfig
 from libmbus2mqtt.constants import (
-    APP_NAME,
     TOPIC_BRIDGE_STATE,
     TOPIC_DEVICE_AVAILABILITY,
     TOPIC_DEVICE_STATE,
@@ -45,18 +45,20 @@ class TestMqttClientProperties:
         client = MqttClient(mqtt_config)
         assert client.is_connected is False
 
-    def test_client_id_uses_config(self, mqtt_config: MqttConfig) -> None:
-        """Test client ID uses config when provided."""
+    @patch("libmbus2mqtt.mqtt.client.mqtt.Client")
+    def test_client_id_uses_config(
+        self,
+        mock_client_class: MagicMock,
+        mqtt_config: MqttConfig,
+    ) -> None:
+        """Test connect passes the configured client ID to paho."""
         mqtt_config.client_id = "my-client-id"
-        client = MqttClient(mqtt_config)
-        assert client._get_client_id() == "my-client-id"
+        mock_client_class.return_value.connect.return_value = 0
 
-    def test_client_id_auto_generated(self, mqtt_config: MqttConfig) -> None:
-        """Test client ID auto-generated when not in config."""
-        mqtt_config.client_id = None
-        client = MqttClient(mqtt_config)
-        client_id = client._get_client_id()
-        assert client_id.startswith(APP_NAME)
+        with patch("threading.Event.wait", return_value=True):
+            MqttClient(mqtt_config).connect()
+
+        assert mock_client_class.call_args.kwargs["client_id"] == "my-client-id"
 
 
 # ============================================================================
@@ -121,6 +123,22 @@ class TestMqttClientConnection:
 
         mock_instance.username_pw_set.assert_called_once_with("user", "pass")
 
+    @patch("libmbus2mqtt.mqtt.client.mqtt.Client")
+    def test_connect_sets_max_inflight(
+        self,
+        mock_client_class: MagicMock,
+    ) -> None:
+        """Test connect applies the configured inflight window."""
+        mock_instance = MagicMock()
+        mock_instance.connect.return_value = 0
+        mock_client_class.return_value = mock_instance
+
+        with patch("threading.Event.wait", return_value=True):
+            client = MqttClient(MqttConfig(host="localhost", max_inflight=50))
+            client.connect()
+
+        mock_instance.max_inflight_messages_set.assert_called_once_with(50)
+
     @patch("libmbus2mqtt.mqtt.client.mqtt.Client")
     def test_connect_sets_last_will(
         self,
@@ -201,8 +219,7 @@ class TestMqttClientPublish:
     def connected_client(self, mqtt_config: MqttConfig) -> MqttClient:
         """Create a mock-connected client."""
         client = MqttClient(mqtt_config)
-        client._client = MagicMock()
-        client._client.publish.return_value = MagicMock(rc=0)
+        client._client = PahoClientStub()  # type: ignore[assignment]
         client._connected.set()
         return client
 
@@ -210,7 +227,7 @@ class TestMqttClientPublish:
         """Test publishing string payload."""
         result = connected_client.publish("test/topic", "hello")
         assert result is True
-        connected_client._client.publish.assert_called_once()
+        assert len(connected_client._client.publish_calls) == 1
 
     def test_publish_dict_payload(self, connected_client: MqttClient) -> None:
         """Test publishing dict payload converts to JSON."""
@@ -218,22 +235,22 @@ class TestMqttClientPublish:
         result = connected_client.publish("test/topic", payload)
         assert result is True
 
-        # Should have been called with JSON string
-        call_args = connected_client._client.publish.call_args
-        assert call_args[0][1] == json.dumps(payload)
+        # Should have been called with serialized JSON
+        call_args = connected_client._client.publish_calls[-1]
+        assert json.loads(call_args[0][1]) == payload
 
     def test_publish_with_retain(self, connected_client: MqttClient) -> None:
         """Test publishing with retain flag."""
         connected_client.publish("test/topic", "hello", retain=True)
 
-        call_args = connected_client._client.publish.call_args
+        call_args = connected_client._client.publish_calls[-1]
         assert call_args[1]["retain"] is True
 
     def test_publish_with_custom_qos(self, connected_client: MqttClient) -> None:
         """Test publishing with custom QoS."""
         connected_client.publish("test/topic", "hello", qos=2)
 
-        call_args = connected_client._client.publish.call_args
+        call_args = connected_client._client.publish_calls[-1]
         assert call_args[1]["qos"] == 2
 
     def test_publish_when_not_connected_returns_false(self, mqtt_config: MqttConfig) -> None:
@@ -244,10 +261,30 @@ class TestMqttClientPublish:
 
     def test_publish_failure_returns_false(self, connected_client: MqttClient) -> None:
         """Test publish failure returns False."""
-        connected_client._client.publish.return_value = MagicMock(rc=1)  # Error
+        connected_client._client.rc = 1  # Error
         result = connected_client.publish("test/topic", "hello")
         assert result is False
 
+    def test_publish_batch(self, connected_client: MqttClient) -> None:
+        """Test publish_batch publishes every message in order."""
+        payload = {"key": "value"}
+        result = connected_client.publish_batch(
+            [("test/a", payload, True), ("test/b", "online", False)]
+        )
+        assert result is True
+
+        calls = connected_client._client.publish_calls
+        assert [c[0][0] for c in calls] == ["test/a", "test/b"]
+        assert json.loads(calls[0][0][1]) == payload
+        assert calls[0][1]["retain"] is True
+        assert calls[1][1]["retain"] is False
+
+    def test_publish_batch_failure_returns_false(self, connected_client: MqttClient) -> None:
+        """Test publish_batch returns False if any message fails."""
+        connected_client._client.rc = 1  # Error
+        result = connected_client.publish_batch([("test/a", "x", False)])
+        assert result is False
+
 
 class TestMqttClientPublishHelpers:
     """Tests for MqttClient publish helper methods."""
@@ -257,8 +294,7 @@ class TestMqttClientPublishHelpers:
         """Create a mock-connected client."""
         config = MqttConfig(host="localhost", base_topic="test")
         client = MqttClient(config)
-        client._client = MagicMock()
-        client._client.publish.return_value = MagicMock(rc=0)
+        client._client = PahoClientStub()  # type: ignore[assignment]
         client._connected.set()
         return client
 
@@ -266,7 +302,7 @@ class TestMqttClientPublishHelpers:
         """Test publish_bridge_state publishes to correct topic."""
         connected_client.publish_bridge_state("online")
 
-        call_args = connected_client._client.publish.call_args
+        call_args = connected_client._client.publish_calls[-1]
         expected_topic = TOPIC_BRIDGE_STATE.format(base="test")
         assert call_args[0][0] == expected_topic
         assert call_args[0][1] == "online"
@@ -277,7 +313,7 @@ class TestMqttClientPublishHelpers:
         state = {"key": "value"}
         connected_client.publish_device_state("device123", state)
 
-        call_args = connected_client._client.publish.call_args
+        call_args = connected_client._client.publish_calls[-1]
         expected_topic = TOPIC_DEVICE_STATE.format(base="test", device_id="device123")
         assert call_args[0][0] == expected_topic
         assert call_args[1]["retain"] is True
@@ -286,7 +322,7 @@ class TestMqttClientPublishHelpers:
         """Test publish_device_availability publishes to correct topic."""
         connected_client.publish_device_availability("device123", "online")
 
-        call_args = connected_client._client.publish.call_args
+        call_args = connected_client._client.publish_calls[-1]
         expected_topic = TOPIC_DEVICE_AVAILABILITY.format(base="test", device_id="device123")
         assert call_args[0][0] == expected_topic
         assert call_args[0][1] == "online"
@@ -302,7 +338,7 @@ class TestMqttClientPublishHelpers:
             discovery_prefix="homeassistant",
         )
 
-        call_args = connected_client._client.publish.call_args
+        call_args = connected_client._client.publish_calls[-1]
         assert call_args[0][0] == "homeassistant/sensor/test_sensor/config"
         assert call_args[1]["retain"] is True
 
@@ -316,9 +352,27 @@ class TestMqttClientPublishHelpers:
             discovery_prefix="custom",
         )
 
-        call_args = connected_client._client.publish.call_args
+        call_args = connected_client._client.publish_calls[-1]
         assert call_args[0][0] == "custom/sensor/test_sensor/config"
 
+    def test_publish_ha_discovery_batch(self, connected_client: MqttClient) -> None:
+        """Test publish_ha_discovery_batch publishes retained configs in order."""
+        result = connected_client.publish_ha_discovery_batch(
+            [
+                ("sensor", "test_sensor", {"name": "Test Sensor"}),
+                ("button", "test_button", {"name": "Test Button"}),
+            ],
+            discovery_prefix="custom",
+        )
+        assert result is True
+
+        calls = connected_client._client.publish_calls
+        assert [c[0][0] for c in calls] == [
+            "custom/sensor/test_sensor/config",
+            "custom/button/test_button/config",
+        ]
+        assert all(c[1]["retain"] is True for c in calls)
+
     def test_remove_ha_discovery(self, connected_client: MqttClient) -> None:
         """Test remove_ha_discovery publishes empty payload."""
         connected_client.remove_ha_discovery(
@@ -327,11 +381,26 @@ class TestMqttClientPublishHelpers:
             discovery_prefix="homeassistant",
         )
 
-        call_args = connected_client._client.publish.call_args
+        call_args = connected_client._client.publish_calls[-1]
         assert call_args[0][0] == "homeassistant/sensor/test_sensor/config"
         assert call_args[0][1] == ""
         assert call_args[1]["retain"] is True
 
+    def test_remove_ha_discovery_batch(self, connected_client: MqttClient) -> None:
+        """Test remove_ha_discovery_batch publishes retained empty payloads in order."""
+        result = connected_client.remove_ha_discovery_batch(
+            [("sensor", "test_sensor"), ("button", "test_button")],
+            discovery_prefix="custom",
+        )
+        assert result is True
+
+        calls = connected_client._client.publish_calls
+        assert [(c[0][0], c[0][1]) for c in calls] == [
+            ("custom/sensor/test_sensor/config", ""),
+            ("custom/button/test_button/config", ""),
+        ]
+        assert all(c[1]["retain"] is True for c in calls)
+
 
 # ============================================================================
 # MqttClient Callback Tests
@@ -5,6 +5,7 @@ from __future__ import annotations
 import pytest
 
 from libmbus2mqtt.mbus.parser import MbusParseError, parse_xml, xml_to_dict
+from libmbus2mqtt.models.mbus import MbusData
 
 
 class TestParseXml:
@@ -69,9 +70,9 @@ class TestParseXml:
         assert data.slave_information is not None
         assert data.manufacturer is not None
 
-    def test_data_records_parsed(self, apator_xml: str) -> None:
+    def test_data_records_parsed(self, apator_mbus_data: MbusData) -> None:
         """Test data records are parsed correctly."""
-        data = parse_xml(apator_xml)
+        data = apator_mbus_data
 
         assert len(data.data_records) > 0
         assert "0" in data.data_records
@@ -83,9 +84,9 @@ class TestParseXml:
         assert record_0.unit == "Fabrication number"
         assert record_0.value == "345678"
 
-    def test_data_record_fields(self, kamstrup_xml: str) -> None:
+    def test_data_record_fields(self, kamstrup_mbus_data: MbusData) -> None:
         """Test data record fields are parsed."""
-        data = parse_xml(kamstrup_xml)
+        data = kamstrup_mbus_data
 
         # Energy record
         record_0 = data.data_records["0"]
@@ -94,16 +95,28 @@ class TestParseXml:
         assert record_0.unit == "Energy (kWh)"
         assert record_0.value == "87247"
 
-    def test_get_record_value_existing(self, apator_xml: str) -> None:
+    def test_repeated_fields_interned(self, kamstrup_xml: str) -> None:
+        """Test low-cardinality fields share one string object across records."""
+        first = parse_xml(kamstrup_xml)
+        second = parse_xml(kamstrup_xml)
+
+        assert first.manufacturer is second.manufacturer
+        assert first.medium is second.medium
+        assert first.version is second.version
+        assert first.product_name is second.product_name
+        assert first.data_records["0"].unit is second.data_records["0"].unit
+        assert first.data_records["0"].function is second.data_records["0"].function
+
+    def test_get_record_value_existing(self, apator_mbus_data: MbusData) -> None:
         """Test get_record_value for existing records."""
-        data = parse_xml(apator_xml)
+        data = apator_mbus_data
 
         assert data.get_record_value("0") == "345678"
         assert data.get_record_value("2") == "33803"
 
-    def test_get_record_value_nonexistent(self, apator_xml: str) -> None:
+    def test_get_record_value_nonexistent(self, apator_mbus_data: MbusData) -> None:
         """Test get_record_value for non-existing record."""
-        data = parse_xml(apator_xml)
+        data = apator_mbus_data
         assert data.get_record_value("999") is None
 
     def test_invalid_xml_raises_error(self) -> None:
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 import pytest
+from helpers import write_json
 
 from libmbus2mqtt import templates
 from libmbus2mqtt.templates import (
@@ -19,8 +21,8 @@ from libmbus2mqtt.templates import (
 
 @pytest.fixture(autouse=True)
 def clear_template_cache() -> None:
-    """Clear template cache before each test."""
-    clear_cache()
+    """Clear user template caches before each test; bundled templates stay loaded."""
+    templates._clear_user_cache()
 
 
 # ============================================================================
@@ -94,6 +96,15 @@ class TestLoadTemplate:
         template2 = load_template("itron_cyble_1_4.json")
         assert template1 is template2  # Same object (cached)
 
+    def test_template_is_read_only(self) -> None:
+        """Test cached templates cannot be mutated by callers."""
+        template = load_template("itron_cyble_1_4.json")
+        assert template is not None
+        with pytest.raises(TypeError):
+            template["new"] = {}  # type: ignore[index]
+        with pytest.raises(TypeError):
+            template["0"]["name"] = "Changed"
+
     def test_cache_clear(self) -> None:
         """Test cache clearing works."""
         template1 = load_template("itron_cyble_1_4.json")
@@ -195,11 +206,11 @@ class TestUserTemplates:
                 "value_template": "{{ value_json.user_sensor }}",
             }
         }
-        (user_templates_dir / "itron_cyble_1_4.json").write_text(json.dumps(user_template))
+        write_json(user_templates_dir / "itron_cyble_1_4.json", user_template)
 
         # Patch TEMPLATES_DIR to point to our temp dir
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         template = load_template("itron_cyble_1_4.json")
         assert template is not None
@@ -218,14 +229,14 @@ class TestUserTemplates:
                 "ProductName": None,
             }
         }
-        (user_templates_dir / "index.json").write_text(json.dumps(user_index))
+        write_json(user_templates_dir / "index.json", user_index)
 
         # Create the template file
         user_template = {"0": {"name": "Custom", "value_template": "{{ value_json.x }}"}}
-        (user_templates_dir / "custom_device.json").write_text(json.dumps(user_template))
+        write_json(user_templates_dir / "custom_device.json", user_template)
 
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         # Should find custom manufacturer
         filename = find_template("XYZ", None)
@@ -247,13 +258,14 @@ class TestUserTemplates:
                 "ProductName": "OnlyOne",
             }
         }
-        (user_templates_dir / "index.json").write_text(json.dumps(user_index))
-        (user_templates_dir / "custom_device.json").write_text(
-            json.dumps({"0": {"name": "Only One", "value_template": "{{ value_json.a }}"}})
+        write_json(user_templates_dir / "index.json", user_index)
+        write_json(
+            user_templates_dir / "custom_device.json",
+            {"0": {"name": "Only One", "value_template": "{{ value_json.a }}"}},
         )
 
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         # User match still works
         filename = find_template("ZZZ", "OnlyOne")
@@ -263,6 +275,41 @@ class TestUserTemplates:
         filename = find_template("KAM", "Kamstrup 382 (6850-005)")
         assert filename == "kamstrup_multical_401.json"
 
+    def test_specific_product_preferred_over_wildcard(
+        self,
+        user_templates_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Specific ProductName entries win over wildcard entries of the same manufacturer."""
+        user_index = {
+            "generic.json": {"Manufacturer": "XYZ", "ProductName": None},
+            "specific.json": {"Manufacturer": "XYZ", "ProductName": "Model A"},
+        }
+        write_json(user_templates_dir / "index.json", user_index)
+
+        monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
+        templates._clear_user_cache()
+
+        assert find_template("XYZ", "Model A") == "specific.json"
+        assert find_template("XYZ", "Model B") == "generic.json"
+
+    def test_user_wildcard_shadows_bundled_product(
+        self,
+        user_templates_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A user wildcard entry wins over bundled entries for the same manufacturer."""
+        user_index = {"my_acw.json": {"Manufacturer": "ACW", "ProductName": None}}
+        write_json(user_templates_dir / "index.json", user_index)
+
+        monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
+        templates._clear_user_cache()
+
+        assert find_template("ACW", "Itron CYBLE M-Bus 1.4") == "my_acw.json"
+        assert find_template("ACW", "Other Product") == "my_acw.json"
+        # Other manufacturers still resolve from the bundled index
+        assert find_template("KAM", "Kamstrup 382 (6850-005)") == "kamstrup_multical_401.json"
+
     def test_fallback_to_bundled_when_no_user_template(
         self,
         user_templates_dir: Path,
@@ -270,7 +317,7 @@ class TestUserTemplates:
     ) -> None:
         """Test falls back to bundled when user template doesn't exist."""
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         # User dir exists but is empty, should fall back to bundled
         template = load_template("itron_cyble_1_4.json")
@@ -291,13 +338,13 @@ class TestUserTemplates:
                 "ProductName": "New Meter Model",
             }
         }
-        (user_templates_dir / "index.json").write_text(json.dumps(user_index))
+        write_json(user_templates_dir / "index.json", user_index)
 
         user_template = {"0": {"name": "New Sensor", "value_template": "{{ value_json.new }}"}}
-        (user_templates_dir / "new_meter.json").write_text(json.dumps(user_template))
+        write_json(user_templates_dir / "new_meter.json", user_template)
 
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         template = get_template_for_device("NEW", "New Meter Model")
         assert template is not None
@@ -327,7 +374,7 @@ class TestUserTemplateErrors:
         """Test invalid JSON syntax raises JSONDecodeError."""
         (user_templates_dir / "invalid.json").write_text('{"0": {"name": "Test"')
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         with pytest.raises(json.JSONDecodeError):
             load_template("invalid.json")
@@ -340,7 +387,7 @@ class TestUserTemplateErrors:
         """Test empty file raises JSONDecodeError."""
         (user_templates_dir / "empty.json").write_text("")
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         with pytest.raises(json.JSONDecodeError):
             load_template("empty.json")
@@ -353,7 +400,7 @@ class TestUserTemplateErrors:
         """Test JSON array instead of object."""
         (user_templates_dir / "array.json").write_text('[{"name": "Test"}]')
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         template = load_template("array.json")
         # Loads successfully but is a list, not dict
@@ -370,7 +417,7 @@ class TestUserTemplateErrors:
         """Test JSON string instead of object."""
         (user_templates_dir / "string.json").write_text('"just a string"')
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         template = load_template("string.json")
         assert template == "just a string"
@@ -386,17 +433,21 @@ class TestUserTemplateErrors:
         """Test file permission error."""
         template_file = user_templates_dir / "noperm.json"
         template_file.write_text('{"0": {"name": "Test"}}')
-        template_file.chmod(0o000)
 
+        # Simulate an unreadable file; chmod(0o000) is ignored when running as root
+        read_bytes = Path.read_bytes
+
+        def deny(path: Path) -> bytes:
+            if path == template_file:
+                raise PermissionError(13, "Permission denied", str(path))
+            return read_bytes(path)
+
+        monkeypatch.setattr(Path, "read_bytes", deny)
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
-        try:
-            with pytest.raises(PermissionError):
-                load_template("noperm.json")
-        finally:
-            # Restore permissions for cleanup
-            template_file.chmod(0o644)
+        with pytest.raises(PermissionError):
+            load_template("noperm.json")
 
 
 class TestUserIndexErrors:
@@ -417,7 +468,7 @@ class TestUserIndexErrors:
         """Test invalid JSON in index raises JSONDecodeError."""
         (user_templates_dir / "index.json").write_text('{"template.json": {')
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         with pytest.raises(json.JSONDecodeError):
             find_template("ANY", None)
@@ -429,9 +480,9 @@ class TestUserIndexErrors:
     ) -> None:
         """Test index references template that doesn't exist."""
         user_index = {"missing.json": {"Manufacturer": "XXX", "ProductName": None}}
-        (user_templates_dir / "index.json").write_text(json.dumps(user_index))
+        write_json(user_templates_dir / "index.json", user_index)
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         # find_template returns the filename
         filename = find_template("XXX", None)
@@ -449,9 +500,9 @@ class TestUserIndexErrors:
         """Test invalid match criteria in index."""
         # Index with wrong key (NotManufacturer instead of Manufacturer)
         user_index = {"template.json": {"NotManufacturer": "XXX"}}
-        (user_templates_dir / "index.json").write_text(json.dumps(user_index))
+        write_json(user_templates_dir / "index.json", user_index)
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         # Should never match (no "Manufacturer" key)
         filename = find_template("XXX", None)
@@ -465,7 +516,7 @@ class TestUserIndexErrors:
         """Test empty index returns no matches."""
         (user_templates_dir / "index.json").write_text("{}")
         monkeypatch.setattr(templates, "TEMPLATES_DIR", user_templates_dir)
-        clear_cache()
+        templates._clear_user_cache()
 
         filename = find_template("ACW", "Itron CYBLE M-Bus 1.4")
         # Empty user index should fall back to bundled index
@@ -513,6 +564,67 @@ class TestCacheBehavior:
         filename = find_template("ACW", "Itron CYBLE M-Bus 1.4")
         assert filename == "itron_cyble_1_4.json"
 
+    def test_clear_user_cache_keeps_bundled(self) -> None:
+        """Test _clear_user_cache drops user state but keeps bundled templates loaded."""
+        bundled = templates._get_bundled_templates()
+        find_template("ACW", "Itron CYBLE M-Bus 1.4")
+
+        templates._clear_user_cache()
+
+        assert templates._get_bundled_templates() is bundled
+        assert templates._find_template.cache_info().currsize == 0
+        assert find_template("ACW", "Itron CYBLE M-Bus 1.4") == "itron_cyble_1_4.json"
+
+    def test_find_template_memoized(self) -> None:
+        """Test repeated lookups are served from the memo until cleared."""
+        find_template("ACW", "Itron CYBLE M-Bus 1.4")
+        find_template("ACW", "Itron CYBLE M-Bus 1.4")
+        assert templates._find_template.cache_info().hits == 1
+
+        clear_cache()
+        assert templates._find_template.cache_info().currsize == 0
+
+    def test_lookup_racing_clear_not_reused(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a lookup that finishes after clear_cache() is not served afterwards."""
+        match_index = templates._match_index
+        calls = 0
+
+        def match_and_clear(*args: Any) -> str | None:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                # Another thread clears the cache while this lookup is in flight
+                clear_cache()
+            return match_index(*args)
+
+        monkeypatch.setattr(templates, "_match_index", match_and_clear)
+
+        find_template("ACW", "Itron CYBLE M-Bus 1.4")
+        find_template("ACW", "Itron CYBLE M-Bus 1.4")
+
+        assert calls == 2
+
+    def test_load_racing_clear_not_cached(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a template read before clear_cache() is not stored in the fresh cache."""
+        read_template = templates._read_template
+
+        def read_and_clear(filename: str) -> Any:
+            template = read_template(filename)
+            # Another thread clears the cache while this load is in flight
+            clear_cache()
+            return template
+
+        monkeypatch.setattr(templates, "_read_template", read_and_clear)
+
+        assert load_template("itron_cyble_1_4.json") is not None
+        assert "itron_cyble_1_4.json" not in templates._cache.templates
+
+    def test_find_template_miss_memoized(self) -> None:
+        """Test unknown devices are resolved once and then served from the memo."""
+        assert find_template("???", None) is None
+        assert find_template("???", None) is None
+        assert templates._find_template.cache_info().hits == 1
+
 
 # ============================================================================
 # Fixture Template Matching Tests
@@ -571,6 +683,12 @@ class TestFixtureTemplateMatching:
 class TestNoIndexFound:
     """Tests for when no index is found."""
 
+    @pytest.fixture(autouse=True)
+    def reset_bundled_cache(self) -> Iterator[None]:
+        """Drop the empty bundled state cached while the paths were patched."""
+        yield
+        clear_cache()
+
     def test_no_index_returns_empty_dict(
         self,
         tmp_path: Path,
@@ -582,7 +700,8 @@ class TestNoIndexFound:
 
         # Patch both user and bundled paths to empty directories
         monkeypatch.setattr(templates, "TEMPLATES_DIR", empty_dir)
-        monkeypatch.setattr(templates, "_get_bundled_templates_path", lambda: empty_dir)
+        monkeypatch.setattr(templates, "_BUNDLED_TEMPLATES_PATH", empty_dir)
+        monkeypatch.setattr(templates, "_BUNDLED_INDEX_PATH", empty_dir / "index.json")
         clear_cache()
 
         # Should return None for any manufacturer
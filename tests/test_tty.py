@@ -0,0 +1,46 @@
+"""Tests for TTY device utilities."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from libmbus2mqtt.mbus import tty
+from libmbus2mqtt.mbus.tty import _read_sysfs_str
+
+
+class TestReadSysfsStr:
+    """Tests for reading sysfs attribute files."""
+
+    def test_reads_and_strips_value(self, tmp_path: Path) -> None:
+        """Test a readable attribute is returned without the trailing newline."""
+        attribute = tmp_path / "idVendor"
+        attribute.write_text("0403\n")
+
+        assert _read_sysfs_str(attribute) == "0403"
+
+    def test_missing_file_returns_none(self, tmp_path: Path) -> None:
+        """Test a missing attribute returns None."""
+        assert _read_sysfs_str(tmp_path / "product") is None
+
+    def test_read_error_returns_none(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test an OSError while reading returns None and still closes the file."""
+        attribute = tmp_path / "manufacturer"
+        attribute.write_text("FTDI\n")
+        closed: list[int] = []
+        close = os.close
+
+        def failing_read(fd: int, size: int) -> bytes:
+            raise OSError(5, "Input/output error")
+
+        def tracking_close(fd: int) -> None:
+            closed.append(fd)
+            close(fd)
+
+        monkeypatch.setattr(tty.os, "read", failing_read)
+        monkeypatch.setattr(tty.os, "close", tracking_close)
+
+        assert _read_sysfs_str(attribute) is None
+        assert len(closed) == 1